@@ -4,4 +4,4 @@
 python -m src.opmas_mgmt_api.db.init_db
 
 # Start the API server
-exec uvicorn opmas_mgmt_api.main:app --host 0.0.0.0 --port 8000 
\ No newline at end of file
+exec uvicorn opmas_mgmt_api.main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools 
\ No newline at end of file
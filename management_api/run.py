@@ -24,6 +24,8 @@ def main():
         "opmas_mgmt_api.main:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
+        http="httptools",
         reload=True,
         reload_dirs=[src_path],
         log_level="info",
@@ -17,16 +17,23 @@ setup(
         "pydantic-settings",
         "python-multipart",
         "prometheus_client",
+        "orjson",
+        "fastjsonschema",
     ],
     extras_require={
         "dev": [
             "pytest>=7.0.0",
-            "pytest-asyncio>=0.21.0",
+            "pytest-asyncio>=0.26.0",
             "pytest-cov>=4.0.0",
+            "pytest-xdist>=3.3.0",
+            "pytest-benchmark>=4.0.0",
             "black>=23.0.0",
             "isort>=5.12.0",
             "flake8>=6.0.0",
         ],
+        "re2": [
+            "google-re2>=1.1",
+        ],
     },
     python_requires=">=3.8",
     author="OPMAS Team",
@@ -10,6 +10,7 @@ from opmas_mgmt_api.core.config import settings
 from opmas_mgmt_api.db.session import async_session
 from opmas_mgmt_api.schemas.auth import User
 from opmas_mgmt_api.services.user import get_user_by_username
+from redis import asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 from opmas_mgmt_api.core.nats import NATSManager
@@ -18,6 +19,9 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login
 
 logger = logging.getLogger(__name__)
 
+# Pooled client shared by all requests; connections open lazily on first use
+_redis: Optional[aioredis.Redis] = None
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Get database session."""
@@ -67,3 +71,25 @@ async def get_nats() -> NATSManager:
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Failed to connect to NATS: {str(e)}",
         )
+
+
+def get_redis() -> aioredis.Redis:
+    """Get the shared Redis client.
+
+    Returns:
+        aioredis.Redis: Redis client backed by a connection pool
+    """
+    global _redis
+    if _redis is None:
+        _redis = aioredis.Redis.from_url(
+            settings.REDIS_URL, max_connections=64, decode_responses=True
+        )
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client, if one was created."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -4,7 +4,8 @@ from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Query
-from opmas_mgmt_api.api.deps import get_db, get_nats
+from nats.errors import Error as NatsError
+from opmas_mgmt_api.api.deps import get_db, get_nats, get_redis
 from opmas_mgmt_api.api.v1.endpoints.route_utils import create_route_builder
 from opmas_mgmt_api.core.exceptions import ResourceNotFoundError, ValidationError
 from opmas_mgmt_api.schemas.devices import (
@@ -19,6 +20,7 @@ from opmas_mgmt_api.schemas.devices import (
     DeviceUpdate,
 )
 from opmas_mgmt_api.services.devices import DeviceService
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -64,14 +66,36 @@ async def create_device(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@route.post(":commit", response_model=DeviceResponse)
+async def commit_device(
+    device: DeviceCreate,
+    db: AsyncSession = Depends(get_db),
+    nats=Depends(get_nats),
+    redis=Depends(get_redis),
+) -> DeviceResponse:
+    """Create a device, cache its status and publish it in a single call."""
+    service = DeviceService(db, nats)
+    try:
+        return await service.commit_device(device, redis)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (RedisError, NatsError, OSError) as e:
+        raise HTTPException(
+            status_code=503, detail=f"Device created but status propagation failed: {str(e)}"
+        )
+
+
 @route.get("/{device_id}", response_model=DeviceResponse)
 async def get_device(device_id: UUID, db: AsyncSession = Depends(get_db), nats=Depends(get_nats)) -> DeviceResponse:
     """Get device by ID."""
     service = DeviceService(db, nats)
     try:
-        return await service.get_device(device_id)
+        device = await service.get_device(device_id)
     except ResourceNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    if device is None:
+        raise HTTPException(status_code=404, detail=f"Device {device_id} not found")
+    return device
 
 
 @route.put("/{device_id}", response_model=DeviceResponse)
@@ -84,11 +108,14 @@ async def update_device(
     """Update a device."""
     service = DeviceService(db, nats)
     try:
-        return await service.update_device(device_id, device)
+        updated = await service.update_device(device_id, device)
     except ResourceNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    if updated is None:
+        raise HTTPException(status_code=404, detail=f"Device {device_id} not found")
+    return updated
 
 
 @route.delete("/{device_id}")
@@ -96,9 +123,11 @@ async def delete_device(device_id: UUID, db: AsyncSession = Depends(get_db), nat
     """Delete a device."""
     service = DeviceService(db, nats)
     try:
-        await service.delete_device(device_id)
+        deleted = await service.delete_device(device_id)
     except ResourceNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"Device {device_id} not found")
 
 
 @route.get("/{device_id}/status", response_model=DeviceStatus)
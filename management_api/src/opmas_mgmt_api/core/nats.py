@@ -3,7 +3,7 @@
 import asyncio
 import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 
 import nats.aio.client as nats
 from opmas_mgmt_api.core.config import settings
@@ -52,21 +52,21 @@ class NATSManager:
             self.connected = False
             logger.info("Disconnected from NATS server")
 
-    async def publish(self, subject: str, payload: Dict[str, Any]) -> None:
+    async def publish(self, subject: str, payload: Union[Dict[str, Any], bytes]) -> None:
         """Publish message to NATS subject.
 
         Args:
             subject: NATS subject
-            payload: Message payload as dictionary
+            payload: Message payload as dictionary, or already serialized JSON bytes
         """
         if not self.connected or not self.client or not self.client.is_connected:
             await self.connect()
 
         try:
-            # Convert dictionary to JSON string
-            message = json.dumps(payload)
+            # Convert dictionary to JSON bytes unless already serialized
+            message = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
             # Publish the message
-            await self.client.publish(subject, message.encode())
+            await self.client.publish(subject, message)
             logger.debug("Published message to %s: %s", subject, payload)
         except Exception as e:
             logger.error("Failed to publish message to %s: %s", subject, e)
@@ -12,10 +12,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
+from opmas_mgmt_api.api.deps import close_redis
 from opmas_mgmt_api.api.v1.api import api_router
 from opmas_mgmt_api.core.config import settings
 from opmas_mgmt_api.core.nats import NATSManager
 from opmas_mgmt_api.db.init_db import init_db
+from opmas_mgmt_api.monitoring import metrics_endpoint, metrics_middleware
 from sqlalchemy.orm import Session
 
 # Configure logging
@@ -51,6 +53,10 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token")
 
+# Prometheus request metrics, exposed at /metrics
+app.middleware("http")(metrics_middleware)
+app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
+
 
 @app.middleware("http")
 async def add_process_time_header(
@@ -105,6 +111,10 @@ async def shutdown_event() -> None:
         nats_manager = NATSManager()
         await nats_manager.disconnect()
         logger.info("NATS connection closed")
+
+        # Close the shared Redis client
+        await close_redis()
+        logger.info("Redis connection closed")
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
 
@@ -122,7 +132,7 @@ async def health_check() -> JSONResponse:
             "status": "healthy",
             "version": "1.0.0",
             "dependencies": {
-                "nats": nats_manager.is_connected,
+                "nats": nats_manager.is_connected(),
             },
         }
     )
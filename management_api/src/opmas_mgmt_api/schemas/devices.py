@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, IPvAnyAddress
+from pydantic import AliasChoices, BaseModel, Field, IPvAnyAddress
 
 
 class DeviceBase(BaseModel):
@@ -13,8 +13,8 @@ class DeviceBase(BaseModel):
     hostname: str = Field(..., description="Device hostname")
     ip_address: IPvAnyAddress = Field(..., description="Device IP address")
     device_type: str = Field(..., description="Type of device (e.g., 'router', 'switch')")
-    model: Optional[str] = Field(None, description="Device model")
-    firmware_version: Optional[str] = Field(None, description="Device firmware version")
+    model: str = Field(..., description="Device model")
+    firmware_version: str = Field(..., description="Device firmware version")
     status: str = Field(default="unknown", description="Device status")
     enabled: bool = Field(default=True, description="Whether the device is enabled")
     metadata: Optional[Dict[str, Any]] = Field(
@@ -45,6 +45,12 @@ class DeviceResponse(DeviceBase):
     """Schema for device response."""
 
     id: UUID = Field(..., description="Device ID")
+    # Read from Device.device_metadata; Device.metadata is the SQLAlchemy table MetaData
+    metadata: Optional[Dict[str, Any]] = Field(
+        default=None,
+        validation_alias=AliasChoices("device_metadata", "metadata"),
+        description="Additional device metadata",
+    )
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
     last_seen: Optional[datetime] = Field(None, description="Last seen timestamp")
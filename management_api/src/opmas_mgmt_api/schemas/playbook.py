@@ -2,9 +2,41 @@ import re
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, validator
-
-from ..models.playbook_execution import ExecutionStatus
+import fastjsonschema
+from pydantic import BaseModel, field_validator
+
+from ..models.playbooks import ExecutionStatus
+
+_NAME_RE = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9-]{0,61}[a-zA-Z0-9]$")
+_VERSION_RE = re.compile(r"^\d+\.\d+\.\d+$")
+
+# Steps are checked by one generated validator; each required field is its own
+# allOf branch so a failure names the missing field
+_validate_steps_schema = fastjsonschema.compile(
+    {
+        "type": "array",
+        "minItems": 1,
+        "items": {
+            "type": "object",
+            "allOf": [{"required": ["type"]}, {"required": ["action"]}],
+        },
+    }
+)
+
+_STEP_ERRORS = {
+    "minItems": "Playbook must have at least one step",
+    "type": "Each step must be a dictionary",
+    "required:type": "Each step must have a type field",
+    "required:action": "Each step must have an action field",
+}
+
+
+def _check_steps(steps: List[Dict[str, Any]]) -> None:
+    try:
+        _validate_steps_schema(steps)
+    except fastjsonschema.JsonSchemaValueException as e:
+        key = f"required:{e.rule_definition[0]}" if e.rule == "required" else e.rule
+        raise ValueError(_STEP_ERRORS[key]) from None
 
 
 class PlaybookBase(BaseModel):
@@ -13,29 +45,24 @@ class PlaybookBase(BaseModel):
     steps: List[Dict[str, Any]]
     version: str
 
-    @validator("name")
+    @field_validator("name", mode="after")
+    @classmethod
     def validate_name(cls, v):
-        if not re.match(r"^[a-zA-Z0-9][a-zA-Z0-9-]{0,61}[a-zA-Z0-9]$", v):
+        if not _NAME_RE.match(v):
             raise ValueError("Invalid playbook name format")
         return v
 
-    @validator("version")
+    @field_validator("version", mode="after")
+    @classmethod
     def validate_version(cls, v):
-        if not re.match(r"^\d+\.\d+\.\d+$", v):
+        if not _VERSION_RE.match(v):
             raise ValueError("Version must be in format x.y.z")
         return v
 
-    @validator("steps")
+    @field_validator("steps", mode="after")
+    @classmethod
     def validate_steps(cls, v):
-        if not v:
-            raise ValueError("Playbook must have at least one step")
-        for step in v:
-            if not isinstance(step, dict):
-                raise ValueError("Each step must be a dictionary")
-            if "type" not in step:
-                raise ValueError("Each step must have a type field")
-            if "action" not in step:
-                raise ValueError("Each step must have an action field")
+        _check_steps(v)
         return v
 
 
@@ -50,30 +77,25 @@ class PlaybookUpdate(BaseModel):
     version: Optional[str] = None
     is_active: Optional[bool] = None
 
-    @validator("name")
+    @field_validator("name", mode="after")
+    @classmethod
     def validate_name(cls, v):
-        if v is not None and not re.match(r"^[a-zA-Z0-9][a-zA-Z0-9-]{0,61}[a-zA-Z0-9]$", v):
+        if v is not None and not _NAME_RE.match(v):
             raise ValueError("Invalid playbook name format")
         return v
 
-    @validator("version")
+    @field_validator("version", mode="after")
+    @classmethod
     def validate_version(cls, v):
-        if v is not None and not re.match(r"^\d+\.\d+\.\d+$", v):
+        if v is not None and not _VERSION_RE.match(v):
             raise ValueError("Version must be in format x.y.z")
         return v
 
-    @validator("steps")
+    @field_validator("steps", mode="after")
+    @classmethod
     def validate_steps(cls, v):
         if v is not None:
-            if not v:
-                raise ValueError("Playbook must have at least one step")
-            for step in v:
-                if not isinstance(step, dict):
-                    raise ValueError("Each step must be a dictionary")
-                if "type" not in step:
-                    raise ValueError("Each step must have a type field")
-                if "action" not in step:
-                    raise ValueError("Each step must have an action field")
+            _check_steps(v)
         return v
 
 
@@ -1,63 +1,134 @@
+import inspect
+import ipaddress
 import logging
 import re
 import time
-from typing import Callable, Dict, List, Optional
+from collections import defaultdict, deque
+from functools import lru_cache
+from typing import Any, Callable, DefaultDict, Deque, List, Optional, Tuple, Union
 
+import fastjsonschema
+import orjson
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
+from redis import asyncio as aioredis
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from .core.exceptions import OPMASException
 
+try:
+    # Linear-time matcher, immune to backtracking blowups on hostile input
+    import re2 as _host_re_engine
+except ImportError:
+    _host_re_engine = re
+
 logger = logging.getLogger(__name__)
 
+_MAX_HOSTNAME_LENGTH = 253
+
+# Compiled once at import; InputValidator runs on request paths. No lookahead
+# so the pattern stays RE2-compatible; the length bound is checked separately.
+# Applied with fullmatch: "$" would let re accept a trailing newline RE2 rejects.
+_HOST_RE = _host_re_engine.compile(
+    r"[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?"
+    r"(\.[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*"
+)
+_UNSAFE_CHARS_RE = re.compile(r"[<>{}[\]\\]")
+
+
+@lru_cache(maxsize=128)
+def _compile_json_schema(schema_key: bytes) -> Callable[[Any], Any]:
+    """Compile a JSON Schema from its sorted-key serialization.
+
+    Keying on the serialized form lets equal schemas share a validator and
+    means a mutated schema compiles afresh; the LRU bound caps memory for
+    callers that build schemas per request.
+    """
+    return fastjsonschema.compile(orjson.loads(schema_key))
+
 
 class RateLimiter:
     def __init__(self, requests_per_minute: int = 60):
         self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, List[float]] = {}
+        # Request times per client, oldest first
+        self.requests: DefaultDict[str, Deque[float]] = defaultdict(deque)
         self.cleanup_interval = 60  # seconds
-        self.last_cleanup = time.time()
+        self.last_cleanup = time.monotonic()
 
     def is_rate_limited(self, client_ip: str) -> bool:
-        current_time = time.time()
+        current_time = time.monotonic()
 
         # Cleanup old requests
         if current_time - self.last_cleanup > self.cleanup_interval:
             self._cleanup_old_requests(current_time)
             self.last_cleanup = current_time
 
-        # Initialize client's request list if not exists
-        if client_ip not in self.requests:
-            self.requests[client_ip] = []
-
         # Remove requests older than 1 minute
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip] if current_time - req_time < 60
-        ]
+        client_requests = self.requests[client_ip]
+        cutoff = current_time - 60
+        while client_requests and client_requests[0] <= cutoff:
+            client_requests.popleft()
 
         # Check if rate limit exceeded
-        if len(self.requests[client_ip]) >= self.requests_per_minute:
+        if len(client_requests) >= self.requests_per_minute:
             return True
 
         # Add current request
-        self.requests[client_ip].append(current_time)
+        client_requests.append(current_time)
         return False
 
     def _cleanup_old_requests(self, current_time: float):
+        cutoff = current_time - 60
         for client_ip in list(self.requests.keys()):
-            self.requests[client_ip] = [
-                req_time for req_time in self.requests[client_ip] if current_time - req_time < 60
-            ]
-            if not self.requests[client_ip]:
+            client_requests = self.requests[client_ip]
+            while client_requests and client_requests[0] <= cutoff:
+                client_requests.popleft()
+            if not client_requests:
                 del self.requests[client_ip]
 
 
+class RedisRateLimiter:
+    """Fixed one-minute window limiter whose counters live in Redis.
+
+    Counts are shared by every API worker and survive restarts, unlike
+    :class:`RateLimiter`, which keeps them in process memory.
+    """
+
+    def __init__(
+        self, redis: aioredis.Redis, requests_per_minute: int = 60, key_prefix: str = "rl"
+    ):
+        self.redis = redis
+        self.requests_per_minute = requests_per_minute
+        self.key_prefix = key_prefix
+
+    @classmethod
+    def from_url(
+        cls,
+        url: str,
+        requests_per_minute: int = 60,
+        key_prefix: str = "rl",
+        max_connections: int = 64,
+    ) -> "RedisRateLimiter":
+        redis = aioredis.Redis.from_url(url, max_connections=max_connections)
+        return cls(redis, requests_per_minute, key_prefix)
+
+    async def is_rate_limited(self, client_ip: str) -> bool:
+        key = f"{self.key_prefix}:{client_ip}:{int(time.time() // 60)}"
+
+        # One round-trip: count this request and let the window key expire
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, 65)
+            count, _ = await pipe.execute()
+
+        return count > self.requests_per_minute
+
+
 class SecurityMiddleware(BaseHTTPMiddleware):
     def __init__(
         self,
         app,
-        rate_limiter: RateLimiter,
+        rate_limiter: Union[RateLimiter, RedisRateLimiter],
         allowed_hosts: List[str] = None,
         allowed_methods: List[str] = None,
         allowed_headers: List[str] = None,
@@ -77,6 +148,12 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             "Content-Security-Policy": "default-src 'self'; style-src 'self' 'unsafe-inline' https://fonts.googleapis.com https://cdn.jsdelivr.net; font-src 'self' https://fonts.gstatic.com; img-src 'self' https://fastapi.tiangolo.com; script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; worker-src 'self' blob:; connect-src 'self'",
             "Referrer-Policy": "strict-origin-when-cross-origin",
         }
+        # Encoded once so each response takes a single list rebuild
+        self._raw_security_headers: List[Tuple[bytes, bytes]] = [
+            (header.lower().encode("latin-1"), value.encode("latin-1"))
+            for header, value in self.security_headers.items()
+        ]
+        self._security_header_names = {name for name, _ in self._raw_security_headers}
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         # Check host header
@@ -85,7 +162,10 @@ class SecurityMiddleware(BaseHTTPMiddleware):
 
         # Check rate limit
         client_ip = request.client.host
-        if self.rate_limiter.is_rate_limited(client_ip):
+        limited = self.rate_limiter.is_rate_limited(client_ip)
+        if inspect.isawaitable(limited):
+            limited = await limited
+        if limited:
             return JSONResponse(status_code=429, content={"detail": "Too many requests"})
 
         # Validate request method
@@ -96,9 +176,10 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         try:
             response = await call_next(request)
 
-            # Add security headers
-            for header, value in self.security_headers.items():
-                response.headers[header] = value
+            # Add security headers, replacing any the handler already set
+            response.raw_headers[:] = [
+                item for item in response.raw_headers if item[0] not in self._security_header_names
+            ] + self._raw_security_headers
 
             return response
         except Exception as e:
@@ -120,28 +201,45 @@ class SecurityMiddleware(BaseHTTPMiddleware):
 class InputValidator:
     @staticmethod
     def validate_ip_address(ip: str) -> bool:
-        pattern = r"^(\d{1,3}\.){3}\d{1,3}$"
-        if not re.match(pattern, ip):
+        try:
+            ipaddress.IPv4Address(ip)
+        except ValueError:
             return False
-
-        return all(0 <= int(x) <= 255 for x in ip.split("."))
+        return True
 
     @staticmethod
     def validate_hostname(hostname: str) -> bool:
-        pattern = r"^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$"
-        return bool(re.match(pattern, hostname))
+        if not hostname or len(hostname) > _MAX_HOSTNAME_LENGTH:
+            return False
+        return bool(_HOST_RE.fullmatch(hostname))
 
     @staticmethod
     def sanitize_input(input_str: str) -> str:
         # Remove potentially dangerous characters
-        return re.sub(r"[<>{}[\]\\]", "", input_str)
+        return _UNSAFE_CHARS_RE.sub("", input_str)
 
     @staticmethod
     def validate_json_schema(data: dict, schema: dict) -> bool:
-        # Basic JSON schema validation
-        for key, value in schema.items():
-            if key not in data:
-                return False
-            if not isinstance(data[key], value):
-                return False
+        # A mapping of field names to Python types
+        is_type = [isinstance(value, (type, tuple)) for value in schema.values()]
+        if all(is_type):
+            for key, value in schema.items():
+                if key not in data:
+                    return False
+                if not isinstance(data[key], value):
+                    return False
+            return True
+        if any(is_type):
+            raise ValueError("Schema mixes Python types with JSON Schema keywords")
+
+        # A JSON Schema document, compiled once per distinct schema
+        try:
+            schema_key = orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)
+        except orjson.JSONEncodeError as e:
+            raise ValueError(f"JSON Schema is not serializable: {e}") from None
+        validate = _compile_json_schema(schema_key)
+        try:
+            validate(data)
+        except fastjsonschema.JsonSchemaException:
+            return False
         return True
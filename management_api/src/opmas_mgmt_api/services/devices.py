@@ -7,11 +7,13 @@ from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 import aiohttp
-from opmas_mgmt_api.core.exceptions import OPMASException
+from opmas_mgmt_api.core.exceptions import OPMASException, ValidationError
 from opmas_mgmt_api.core.nats import NATSManager
 from opmas_mgmt_api.models.devices import Device
 from opmas_mgmt_api.schemas.devices import DeviceCreate, DeviceDiscovery, DeviceList, DeviceStatus, DeviceUpdate
-from sqlalchemy import delete, func, select, update
+from opmas_mgmt_api.services.logs import _utcnow
+from redis import asyncio as aioredis
+from sqlalchemy import delete, func, or_, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -37,20 +39,7 @@ class DeviceService:
     ) -> DeviceList:
         """List devices with pagination and filtering."""
         # Build base query
-        query = select(
-            Device.id,
-            Device.hostname,
-            Device.ip_address,
-            Device.device_type,
-            Device.model,
-            Device.firmware_version,
-            Device.status,
-            Device.enabled,
-            Device.device_metadata,
-            Device.created_at,
-            Device.updated_at,
-            Device.last_seen,
-        )
+        query = select(Device)
         count_query = select(func.count()).select_from(Device)
 
         # Apply filters
@@ -107,14 +96,35 @@ class DeviceService:
 
         return DeviceList(items=devices, total=total, skip=skip, limit=limit)
 
+    @staticmethod
+    def _build_device(device: DeviceCreate, **overrides: Any) -> Device:
+        """Build a new device row from a create payload."""
+        now = _utcnow()
+        fields = device.model_dump(mode="json", exclude={"metadata"})
+        fields.update(device_metadata=device.metadata or {}, created_at=now, updated_at=now)
+        fields.update(overrides)
+        return Device(**fields)
+
+    async def _check_unique(self, device: DeviceCreate) -> None:
+        """Reject a new device whose hostname or IP address is already registered."""
+        ip_address = str(device.ip_address)
+        query = (
+            select(Device)
+            .where(or_(Device.hostname == device.hostname, Device.ip_address == ip_address))
+            .limit(1)
+        )
+        result = await self.db.execute(query)
+        existing = result.scalar_one_or_none()
+        if existing is None:
+            return
+        if existing.hostname == device.hostname:
+            raise ValidationError(f"Device creation failed: duplicate hostname: {device.hostname}")
+        raise ValidationError(f"Device creation failed: duplicate IP address: {ip_address}")
+
     async def create_device(self, device: DeviceCreate) -> Device:
         """Create a new device."""
-        db_device = Device(
-            **device.model_dump(),
-            status="inactive",
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
-        )
+        await self._check_unique(device)
+        db_device = self._build_device(device, status="inactive")
 
         try:
             self.db.add(db_device)
@@ -125,6 +135,39 @@ class DeviceService:
             await self.db.rollback()
             raise OPMASException(status_code=400, detail=f"Device creation failed: {str(e)}")
 
+    async def commit_device(self, device: DeviceCreate, redis: aioredis.Redis) -> Device:
+        """Create a device, then cache its status and announce it.
+
+        The row is committed first so neither Redis nor NATS ever refers to a
+        device that does not exist. The status cache write and the NATS event
+        then run concurrently; if either fails its error propagates, but the
+        committed device is kept.
+        """
+        await self._check_unique(device)
+        db_device = self._build_device(device)
+        db_device.last_seen = db_device.created_at
+
+        try:
+            self.db.add(db_device)
+            await self.db.commit()
+            await self.db.refresh(db_device)
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise OPMASException(status_code=400, detail=f"Device creation failed: {str(e)}")
+
+        timestamp = db_device.last_seen.isoformat()
+        await asyncio.gather(
+            redis.hset(
+                f"device:status:{db_device.id}",
+                mapping={"status": db_device.status, "last_seen": timestamp},
+            ),
+            self.nats.publish(
+                f"device.status.{db_device.id}",
+                {"device_id": str(db_device.id), "status": db_device.status, "timestamp": timestamp},
+            ),
+        )
+        return db_device
+
     async def get_device(self, device_id: UUID) -> Optional[Device]:
         """Get device by ID."""
         query = select(Device).where(Device.id == device_id)
@@ -1,11 +1,10 @@
 """Log ingestion service."""
 
-import json
 import logging
-import re
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 from opmas_mgmt_api.core.exceptions import OPMASException
 from opmas_mgmt_api.core.nats import NATSManager
 from opmas_mgmt_api.models.logs import LogEntry, LogSource
@@ -16,6 +15,62 @@ from sqlalchemy.orm import selectinload
 
 logger = logging.getLogger(__name__)
 
+# RFC 3164 month abbreviations, independent of the process locale
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"),
+        start=1,
+    )
+}
+
+
+def _utcnow() -> datetime:
+    """Return the current UTC time as a naive datetime, matching the log columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _skip_whitespace(line: str, i: int) -> int:
+    """Return the index of the first non-whitespace character after ``i``.
+
+    The character at ``i`` must itself be whitespace, so fields stay separated.
+    """
+    n = len(line)
+    if i >= n or not line[i].isspace():
+        raise ValueError("missing field separator")
+    while i < n and line[i].isspace():
+        i += 1
+    if i == n:
+        raise ValueError("unexpected end of line")
+    return i
+
+
+def _token_end(line: str, i: int) -> int:
+    """Return the index just past the non-whitespace run starting at ``i``."""
+    n = len(line)
+    while i < n and not line[i].isspace():
+        i += 1
+    return i
+
+
+def _is_clock(text: str) -> bool:
+    """Return whether ``text`` is an ``HH:MM:SS`` time of day."""
+    return (
+        len(text) == 8
+        and text[2] == ":"
+        and text[5] == ":"
+        and (text[0:2] + text[3:5] + text[6:8]).isdecimal()
+    )
+
+
+def _parse_syslog_timestamp(timestamp: str) -> datetime:
+    """Parse an RFC 3164 ``MMM DD HH:MM:SS`` timestamp in the current year."""
+    month, day, clock = timestamp.split()
+    hour, minute, second = clock.split(":")
+    return datetime(
+        datetime.now().year, _MONTHS[month], int(day), int(hour), int(minute), int(second)
+    )
+
 
 class LogService:
     """Service for handling log ingestion and processing."""
@@ -29,9 +84,6 @@ class LogService:
         """
         self.db = db
         self.nats = nats
-        self.syslog_pattern = re.compile(
-            r"<(\d+)>(\w{3}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2})\s+(\S+)\s+([^:]+):\s+(.*)"
-        )
 
     async def process_logs(
         self,
@@ -41,6 +93,11 @@ class LogService:
     ) -> int:
         """Process a batch of logs.
 
+        The parsed batch is saved in one transaction, so a row the database
+        rejects or a failed commit rolls back the whole batch. Rows are
+        committed before publishing; if the batch publish fails the stored
+        rows are kept but none are counted as processed.
+
         Args:
             logs: List of log entries to process
             source_identifier: Optional identifier for the log source
@@ -58,55 +115,93 @@ class LogService:
             # Get or create log source
             source = await self._get_or_create_source(source_identifier, source_ip)
 
-            # Process each log
+            # Parse each log
+            entries = []
+            parsed_logs = []
             for log_entry in logs:
                 try:
                     # Parse log entry
                     parsed_log = self._parse_log(log_entry)
 
-                    # Create log entry in database
-                    log_entry_create = LogEntryCreate(
-                        source_id=source.id,
-                        timestamp=parsed_log["timestamp"],
-                        level=parsed_log["level"],
-                        facility=parsed_log["facility"],
-                        message=parsed_log["message"],
-                        raw_log=log_entry,
+                    entries.append(
+                        LogEntryCreate(
+                            source_id=source.id,
+                            timestamp=parsed_log["timestamp"],
+                            level=parsed_log["level"],
+                            facility=parsed_log["facility"],
+                            message=parsed_log["message"],
+                            raw_log=log_entry,
+                        )
                     )
-
-                    # Save to database
-                    await self._save_log_entry(log_entry_create)
-
-                    # Publish to NATS for further processing
-                    await self._publish_log(parsed_log, source)
-
-                    processed_count += 1
+                    parsed_logs.append(parsed_log)
 
                 except Exception as e:
                     logger.error(f"Failed to process log entry: {e}", exc_info=True)
                     continue
 
+            # Save the whole batch in one transaction
+            await self._save_log_entries_bulk(entries)
+
+            # Publish to NATS for further processing
+            try:
+                await self._publish_logs_batch([(parsed_log, source) for parsed_log in parsed_logs])
+                processed_count = len(parsed_logs)
+            except Exception as e:
+                logger.error(f"Failed to publish log batch: {e}", exc_info=True)
+
             return processed_count
 
         except Exception as e:
             logger.error(f"Log processing failed: {e}", exc_info=True)
             raise OPMASException(f"Failed to process logs: {str(e)}")
 
-    async def get_statistics(self) -> Dict[str, Any]:
-        """Get log statistics."""
+    async def get_statistics(
+        self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Get log statistics.
+
+        Args:
+            start_time: Optional start of the time range
+            end_time: Optional end of the time range
+
+        Returns:
+            Dict[str, Any]: Totals, per-source counts and the requested time range
+        """
+        time_range = {
+            "start": start_time.isoformat() if start_time else None,
+            "end": end_time.isoformat() if end_time else None,
+        }
+        conditions = []
+        if start_time:
+            conditions.append(LogEntry.timestamp >= start_time)
+        if end_time:
+            conditions.append(LogEntry.timestamp <= end_time)
+
         try:
             # Get total logs count
-            total_logs = await self.db.scalar(select(func.count()).select_from(LogEntry)) or 0
+            total_logs = (
+                await self.db.scalar(select(func.count()).select_from(LogEntry).where(*conditions))
+                or 0
+            )
 
             # Get logs by severity in last 24 hours
-            last_24h = datetime.utcnow() - timedelta(hours=24)
+            last_24h = _utcnow() - timedelta(hours=24)
             severity_counts = await self.db.execute(
-                select(LogEntry.level, func.count())
+                select(LogEntry.level, func.count().label("count"))
                 .select_from(LogEntry)
                 .where(LogEntry.timestamp >= last_24h)
                 .group_by(LogEntry.level)
             )
-            severity_stats = {row[0]: row[1] for row in severity_counts}
+            severity_stats = {row.level: row.count for row in severity_counts}
+
+            # Get logs by source
+            source_counts = await self.db.execute(
+                select(LogSource.identifier, func.count(LogEntry.id).label("count"))
+                .join(LogEntry, LogEntry.source_id == LogSource.id)
+                .where(*conditions)
+                .group_by(LogSource.identifier)
+            )
+            source_stats = {row.identifier: row.count for row in source_counts}
 
             return {
                 "total_logs": total_logs,
@@ -116,10 +211,12 @@ class LogService:
                     "info": severity_stats.get("info", 0),
                     "debug": severity_stats.get("debug", 0),
                 },
+                "source_stats": source_stats,
+                "time_range": time_range,
             }
         except Exception as e:
             logger.error(f"Error getting log statistics: {e}")
-            return {"total_logs": 0, "last_24h": {}}
+            return {"total_logs": 0, "last_24h": {}, "source_stats": {}, "time_range": time_range}
 
     async def get_recent_logs(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent log entries."""
@@ -176,7 +273,7 @@ class LogService:
             source = LogSource(
                 identifier=identifier,
                 ip_address=ip_address,
-                created_at=datetime.utcnow(),
+                created_at=_utcnow(),
             )
             self.db.add(source)
             await self.db.commit()
@@ -196,33 +293,34 @@ class LogService:
         Raises:
             ValueError: If log parsing fails
         """
-        # Try syslog format first
-        match = self.syslog_pattern.match(log_entry)
-        if match:
-            priority, timestamp, hostname, program, message = match.groups()
-            facility = int(priority) // 8
-            level = int(priority) % 8
-
-            # Parse timestamp
+        # Only lines opening with a PRI field can be syslog; skip the scanner otherwise
+        if log_entry.startswith("<"):
             try:
-                parsed_timestamp = datetime.strptime(
-                    f"{datetime.now().year} {timestamp}", "%Y %b %d %H:%M:%S"
-                )
+                priority, timestamp, hostname, program, message = self._scan_syslog(log_entry)
             except ValueError:
-                parsed_timestamp = datetime.utcnow()
+                pass
+            else:
+                facility = priority >> 3
+                level = priority & 7
 
-            return {
-                "timestamp": parsed_timestamp,
-                "level": level,
-                "facility": facility,
-                "hostname": hostname,
-                "program": program,
-                "message": message,
-            }
+                # Parse timestamp
+                try:
+                    parsed_timestamp = _parse_syslog_timestamp(timestamp)
+                except (KeyError, ValueError):
+                    parsed_timestamp = _utcnow()
+
+                return {
+                    "timestamp": parsed_timestamp,
+                    "level": level,
+                    "facility": facility,
+                    "hostname": hostname,
+                    "program": program,
+                    "message": message,
+                }
 
         # Fall back to raw text format
         return {
-            "timestamp": datetime.utcnow(),
+            "timestamp": _utcnow(),
             "level": 6,  # INFO
             "facility": 1,  # user-level
             "hostname": None,
@@ -230,6 +328,59 @@ class LogService:
             "message": log_entry,
         }
 
+    @staticmethod
+    def _scan_syslog(line: str) -> Tuple[int, str, str, str, str]:
+        """Split an RFC 3164 syslog line into its fields.
+
+        Walks the line with a cursor instead of a regex:
+        ``<PRI>MMM DD HH:MM:SS hostname program: message``. The month, day and
+        time fields are checked so other layouts (e.g. RFC 5424) are rejected.
+        Callers check for the leading ``<`` before calling.
+
+        Args:
+            line: Raw log entry
+
+        Returns:
+            Tuple[int, str, str, str, str]: Priority, timestamp, hostname, program, message
+
+        Raises:
+            ValueError: If the line is not in syslog format
+        """
+        end = line.index(">", 1)
+        pri_text = line[1:end]
+        if not pri_text.isdigit():
+            raise ValueError("invalid PRI")
+        priority = int(pri_text)
+
+        # Timestamp: "MMM DD HH:MM:SS"; single-digit days are space padded
+        start = end + 1
+        if line[start : start + 3] not in _MONTHS:
+            raise ValueError("invalid month")
+        i = _skip_whitespace(line, start + 3)
+        end = _token_end(line, i)
+        if not (1 <= end - i <= 2 and line[i:end].isdecimal()):
+            raise ValueError("invalid day")
+        i = _skip_whitespace(line, end)
+        end = i + 8
+        if not _is_clock(line[i:end]):
+            raise ValueError("invalid time")
+        timestamp = line[start:end]
+
+        i = _skip_whitespace(line, end)
+        end = _token_end(line, i)
+        hostname = line[i:end]
+
+        i = _skip_whitespace(line, end)
+        end = line.index(":", i)
+        program = line[i:end]
+
+        # Message must be separated from the program tag by whitespace
+        if not line[end + 1 : end + 2].isspace():
+            raise ValueError("missing message separator")
+        message = line[end + 1 :].lstrip()
+
+        return priority, timestamp, hostname, program, message
+
     async def _save_log_entry(self, log_entry: LogEntryCreate) -> LogEntry:
         """Save a log entry to the database.
 
@@ -239,20 +390,45 @@ class LogService:
         Returns:
             LogEntry: Created log entry
         """
-        db_log = LogEntry(**log_entry.dict())
+        db_log = LogEntry(**log_entry.model_dump())
         self.db.add(db_log)
         await self.db.commit()
         await self.db.refresh(db_log)
         return db_log
 
-    async def _publish_log(self, log_data: Dict[str, Any], source: LogSource) -> None:
-        """Publish log to NATS for further processing.
+    async def _save_log_entries_bulk(self, log_entries: List[LogEntryCreate]) -> List[LogEntry]:
+        """Save a batch of log entries with a single commit.
+
+        Args:
+            log_entries: Log entry data
+
+        Returns:
+            List[LogEntry]: Created log entries
+        """
+        if not log_entries:
+            return []
+
+        db_logs = [LogEntry(**log_entry.model_dump()) for log_entry in log_entries]
+        self.db.add_all(db_logs)
+        try:
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return db_logs
+
+    @staticmethod
+    def _log_message(log_data: Dict[str, Any], source: LogSource) -> Dict[str, Any]:
+        """Build the NATS message for a parsed log.
 
         Args:
             log_data: Parsed log data
             source: Log source
+
+        Returns:
+            Dict[str, Any]: Message payload
         """
-        message = {
+        return {
             "timestamp": log_data["timestamp"].isoformat(),
             "level": log_data["level"],
             "facility": log_data["facility"],
@@ -266,7 +442,27 @@ class LogService:
             },
         }
 
-        await self.nats.publish("logs.ingested", json.dumps(message))
+    async def _publish_log(self, log_data: Dict[str, Any], source: LogSource) -> None:
+        """Publish log to NATS for further processing.
+
+        Args:
+            log_data: Parsed log data
+            source: Log source
+        """
+        message = self._log_message(log_data, source)
+        await self.nats.publish("logs.ingested", orjson.dumps(message))
+
+    async def _publish_logs_batch(self, items: List[Tuple[Dict[str, Any], LogSource]]) -> None:
+        """Publish a batch of logs to NATS as a single message.
+
+        Args:
+            items: Parsed log data and log source pairs
+        """
+        if not items:
+            return
+
+        messages = [self._log_message(log_data, source) for log_data, source in items]
+        await self.nats.publish("logs.ingested.batch", orjson.dumps(messages))
 
     async def get_status(self) -> Dict[str, Any]:
         """Get log ingestion service status.
@@ -303,7 +499,7 @@ class LogService:
                 message=message,
                 source=source,
                 details=details or {},
-                timestamp=datetime.utcnow(),
+                timestamp=_utcnow(),
             )
             self.db.add(log)
             await self.db.commit()
@@ -0,0 +1,95 @@
+"""Lightweight stand-ins for ORM models in service tests.
+
+Service tests mock the database session, so the objects it returns never touch
+the SQLAlchemy mapper. These dataclasses duplicate the attribute surface the
+services and tests read, without declarative model instrumentation.
+``FastAsyncSession`` and ``FakeResult`` stand in for the session and its results.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID
+
+
+@dataclass(slots=True)
+class FakeAgent:
+    """Duck-typed stand-in for :class:`opmas_mgmt_api.models.agents.Agent`."""
+
+    id: UUID
+    name: str
+    agent_type: str
+    hostname: str
+    ip_address: str
+    port: int
+    status: str
+    enabled: bool
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    config: Dict[str, Any] = field(default_factory=dict)
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    last_seen: Optional[datetime] = None
+    last_heartbeat: Optional[datetime] = None
+    capabilities: Dict[str, Any] = field(default_factory=dict)
+    device_status: Optional[str] = None
+    status_details: Dict[str, Any] = field(default_factory=dict)
+    config_version: Optional[str] = None
+    config_updated_at: Optional[datetime] = None
+    config_metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class FakeDevice:
+    """Duck-typed stand-in for :class:`opmas_mgmt_api.models.devices.Device`."""
+
+    id: UUID
+    hostname: str
+    ip_address: str
+    device_type: str
+    model: str
+    firmware_version: str
+    status: str
+    enabled: bool
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    last_seen: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class FakeResult:
+    """Preset stand-in for the SQLAlchemy ``Result`` returned by ``execute``."""
+
+    value: Any = None
+    row: Any = None
+    rows: List[Any] = field(default_factory=list)
+
+    def scalar_one(self):
+        return self.value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+    def first(self):
+        return self.row
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class FastAsyncSession:
+    """Minimal async session stub exposing only the methods services call."""
+
+    __slots__ = ("get", "execute", "delete", "commit", "add", "refresh", "rollback")
+
+    def __init__(self, ret):
+        self.get = AsyncMock(return_value=ret)
+        self.execute = AsyncMock(
+            return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=ret))
+        )
+        self.delete = AsyncMock()
+        self.commit = AsyncMock()
+        self.add = MagicMock()
+        self.refresh = AsyncMock()
+        self.rollback = AsyncMock()
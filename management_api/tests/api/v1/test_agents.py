@@ -58,8 +58,12 @@ def test_agent_update():
 def mock_db_session(test_agent):
     """Create a mock database session."""
     session = AsyncMock(spec=AsyncSession)
-    session.get.return_value = test_agent
-    session.execute.return_value.scalar_one_or_none.return_value = test_agent
+    session.configure_mock(
+        **{
+            "get.return_value": test_agent,
+            "execute.return_value.scalar_one_or_none.return_value": test_agent,
+        }
+    )
     return session
 
 
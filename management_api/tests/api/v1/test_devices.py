@@ -58,8 +58,12 @@ def test_device_update():
 def mock_db_session(test_device):
     """Create a mock database session."""
     session = AsyncMock(spec=AsyncSession)
-    session.get.return_value = test_device
-    session.execute.return_value.scalar_one_or_none.return_value = test_device
+    session.configure_mock(
+        **{
+            "get.return_value": test_device,
+            "execute.return_value.scalar_one_or_none.return_value": test_device,
+        }
+    )
     return session
 
 
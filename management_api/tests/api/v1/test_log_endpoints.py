@@ -180,18 +180,18 @@ async def test_get_log_ingestion_stats(mock_db, mock_nats):
 
     start_time = datetime.utcnow() - timedelta(days=1)
     end_time = datetime.utcnow()
+    expected_start = start_time.isoformat()
+    expected_end = end_time.isoformat()
 
-    response = client.get(
-        f"/api/v1/logs/stats?start_time={start_time.isoformat()}&end_time={end_time.isoformat()}"
-    )
+    response = client.get(f"/api/v1/logs/stats?start_time={expected_start}&end_time={expected_end}")
 
     assert response.status_code == 200
     data = response.json()
     assert data["total_logs"] == 100
     assert "source_stats" in data
     assert "time_range" in data
-    assert data["time_range"]["start"] == start_time.isoformat()
-    assert data["time_range"]["end"] == end_time.isoformat()
+    assert data["time_range"]["start"] == expected_start
+    assert data["time_range"]["end"] == expected_end
 
 
 @pytest.mark.asyncio
@@ -1,27 +1,46 @@
 """Test configuration and fixtures."""
 
-import asyncio
+import os
 from typing import AsyncGenerator, Generator
 
 import pytest
 from fastapi.testclient import TestClient
+from opmas_mgmt_api.api.deps import get_db
 from opmas_mgmt_api.core.nats import NATSManager
 from opmas_mgmt_api.db.base import Base
-from opmas_mgmt_api.db.session import get_db
 from opmas_mgmt_api.main import app
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-# Test database URL
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+# Test database URL (override with TEST_DATABASE_URL to run against Postgres)
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+# pytest-xdist worker id, e.g. "gw0"; unset when running without -n
+XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER")
 
 # Create async engine for testing
-engine = create_async_engine(
-    TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+if TEST_DATABASE_URL.startswith("sqlite"):
+    # In-memory SQLite is private to each xdist worker process
+    engine = create_async_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+else:
+    engine = create_async_engine(TEST_DATABASE_URL)
+
+if XDIST_WORKER and engine.dialect.name == "postgresql":
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _use_worker_schema(dbapi_connection, connection_record):
+        """Give each xdist worker its own schema so tables don't contend."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {XDIST_WORKER}")
+        cursor.execute(f"SET search_path TO {XDIST_WORKER}")
+        cursor.close()
+
 
 # Create test session factory
 TestingSessionLocal = sessionmaker(
@@ -31,14 +50,6 @@ TestingSessionLocal = sessionmaker(
 )
 
 
-@pytest.fixture(scope="session")
-def event_loop() -> Generator:
-    """Create an instance of the default event loop for each test case."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
 @pytest.fixture(scope="session")
 async def test_db() -> AsyncGenerator:
     """Create test database and tables."""
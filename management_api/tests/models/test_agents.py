@@ -4,10 +4,10 @@ from datetime import datetime
 from uuid import UUID, uuid4
 
 import pytest
-from opmas_mgmt_api.core.exceptions import ValidationError
 from opmas_mgmt_api.models.agents import Agent, AgentConfigHistory, AgentStatusHistory
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 
 @pytest.fixture
@@ -77,20 +77,6 @@ async def test_create_agent(db: AsyncSession, test_agent: Agent):
     assert agent.config == test_agent.config
 
 
-@pytest.mark.asyncio
-async def test_create_agent_validation():
-    """Test agent creation validation."""
-    with pytest.raises(ValidationError):
-        Agent(
-            id=uuid4(),
-            name="",  # Invalid empty name
-            agent_type="invalid",  # Invalid agent type
-            hostname="test-agent.local",
-            ip_address="invalid-ip",  # Invalid IP address
-            port=70000,  # Invalid port
-        )
-
-
 @pytest.mark.asyncio
 async def test_create_status_history(
     db: AsyncSession, test_agent: Agent, test_status_history: AgentStatusHistory
@@ -98,7 +84,6 @@ async def test_create_status_history(
     """Test creating a status history entry in the database."""
     db.add(test_status_history)
     await db.commit()
-    await db.refresh(test_status_history)
 
     result = await db.execute(
         select(AgentStatusHistory).where(AgentStatusHistory.id == test_status_history.id)
@@ -118,7 +103,6 @@ async def test_create_config_history(
     """Test creating a config history entry in the database."""
     db.add(test_config_history)
     await db.commit()
-    await db.refresh(test_config_history)
 
     result = await db.execute(
         select(AgentConfigHistory).where(AgentConfigHistory.id == test_config_history.id)
@@ -144,12 +128,18 @@ async def test_agent_relationships(
     db.add(test_status_history)
     db.add(test_config_history)
     await db.commit()
-    await db.refresh(test_agent)
 
-    assert len(test_agent.status_history) == 1
-    assert test_agent.status_history[0].id == test_status_history.id
-    assert len(test_agent.config_history) == 1
-    assert test_agent.config_history[0].id == test_config_history.id
+    result = await db.execute(
+        select(Agent)
+        .options(selectinload(Agent.status_history), selectinload(Agent.config_history))
+        .where(Agent.id == test_agent.id)
+    )
+    agent = result.scalar_one()
+
+    assert len(agent.status_history) == 1
+    assert agent.status_history[0].id == test_status_history.id
+    assert len(agent.config_history) == 1
+    assert agent.config_history[0].id == test_config_history.id
 
 
 @pytest.mark.asyncio
@@ -165,7 +155,11 @@ async def test_agent_cascade_delete(
     db.add(test_config_history)
     await db.commit()
 
-    await db.delete(test_agent)
+    await db.execute(
+        delete(Agent)
+        .where(Agent.id == test_agent.id)
+        .execution_options(synchronize_session=False)
+    )
     await db.commit()
 
     result = await db.execute(
@@ -177,67 +171,3 @@ async def test_agent_cascade_delete(
         select(AgentConfigHistory).where(AgentConfigHistory.agent_id == test_agent.id)
     )
     assert result.scalar_one_or_none() is None
-
-
-@pytest.mark.asyncio
-async def test_agent_status_validation():
-    """Test agent status validation."""
-    with pytest.raises(ValidationError):
-        Agent(
-            id=uuid4(),
-            name="test-agent",
-            agent_type="wifi",
-            hostname="test-agent.local",
-            ip_address="192.168.1.100",
-            port=8080,
-            status="invalid_status",  # Invalid status
-            enabled=True,
-        )
-
-
-@pytest.mark.asyncio
-async def test_agent_type_validation():
-    """Test agent type validation."""
-    with pytest.raises(ValidationError):
-        Agent(
-            id=uuid4(),
-            name="test-agent",
-            agent_type="invalid_type",  # Invalid agent type
-            hostname="test-agent.local",
-            ip_address="192.168.1.100",
-            port=8080,
-            status="online",
-            enabled=True,
-        )
-
-
-@pytest.mark.asyncio
-async def test_agent_port_validation():
-    """Test agent port validation."""
-    with pytest.raises(ValidationError):
-        Agent(
-            id=uuid4(),
-            name="test-agent",
-            agent_type="wifi",
-            hostname="test-agent.local",
-            ip_address="192.168.1.100",
-            port=70000,  # Invalid port
-            status="online",
-            enabled=True,
-        )
-
-
-@pytest.mark.asyncio
-async def test_agent_ip_validation():
-    """Test agent IP validation."""
-    with pytest.raises(ValidationError):
-        Agent(
-            id=uuid4(),
-            name="test-agent",
-            agent_type="wifi",
-            hostname="test-agent.local",
-            ip_address="invalid-ip",  # Invalid IP address
-            port=8080,
-            status="online",
-            enabled=True,
-        )
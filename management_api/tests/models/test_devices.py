@@ -6,9 +6,6 @@ from uuid import UUID, uuid4
 import pytest
 from opmas_mgmt_api.db.base_class import Base
 from opmas_mgmt_api.models.devices import Device, DeviceStatusHistory
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
 
 
 @pytest.fixture
@@ -60,19 +57,21 @@ def test_device_creation(test_device):
 
 def test_device_to_dict(test_device):
     """Test device to_dict method."""
-    device_dict = test_device.to_dict()
-    assert device_dict["id"] == str(test_device.id)
-    assert device_dict["hostname"] == test_device.hostname
-    assert device_dict["ip_address"] == str(test_device.ip_address)
-    assert device_dict["device_type"] == test_device.device_type
-    assert device_dict["model"] == test_device.model
-    assert device_dict["firmware_version"] == test_device.firmware_version
-    assert device_dict["status"] == test_device.status
-    assert device_dict["enabled"] == test_device.enabled
-    assert device_dict["metadata"] == test_device.metadata
-    assert device_dict["created_at"] == test_device.created_at.isoformat()
-    assert device_dict["updated_at"] == test_device.updated_at.isoformat()
-    assert device_dict["last_seen"] == test_device.last_seen.isoformat()
+    expected = {
+        "id": str(test_device.id),
+        "hostname": test_device.hostname,
+        "ip_address": str(test_device.ip_address),
+        "device_type": test_device.device_type,
+        "model": test_device.model,
+        "firmware_version": test_device.firmware_version,
+        "status": test_device.status,
+        "enabled": test_device.enabled,
+        "metadata": test_device.metadata,
+        "created_at": test_device.created_at.isoformat(),
+        "updated_at": test_device.updated_at.isoformat(),
+        "last_seen": test_device.last_seen.isoformat(),
+    }
+    assert test_device.to_dict() == expected
 
 
 def test_status_history_creation(test_status_history):
@@ -86,12 +85,14 @@ def test_status_history_creation(test_status_history):
 
 def test_status_history_to_dict(test_status_history):
     """Test status history to_dict method."""
-    history_dict = test_status_history.to_dict()
-    assert history_dict["id"] == str(test_status_history.id)
-    assert history_dict["device_id"] == str(test_status_history.device_id)
-    assert history_dict["status"] == test_status_history.status
-    assert history_dict["timestamp"] == test_status_history.timestamp.isoformat()
-    assert history_dict["details"] == test_status_history.details
+    expected = {
+        "id": str(test_status_history.id),
+        "device_id": str(test_status_history.device_id),
+        "status": test_status_history.status,
+        "timestamp": test_status_history.timestamp.isoformat(),
+        "details": test_status_history.details,
+    }
+    assert test_status_history.to_dict() == expected
 
 
 def test_device_relationships(test_device, test_status_history):
@@ -104,20 +105,23 @@ def test_device_relationships(test_device, test_status_history):
 
 def test_device_indexes():
     """Test device indexes."""
-    indexes = Device.__table_args__
-    assert any(index.name == "ix_devices_hostname" for index in indexes)
-    assert any(index.name == "ix_devices_ip_address" for index in indexes)
-    assert any(index.name == "ix_devices_device_type" for index in indexes)
-    assert any(index.name == "ix_devices_status" for index in indexes)
-    assert any(index.name == "ix_devices_enabled" for index in indexes)
-    assert any(index.name == "ix_devices_agent_id" for index in indexes)
+    names = {index.name for index in Device.__table_args__}
+    expected = {
+        "ix_devices_hostname",
+        "ix_devices_ip_address",
+        "ix_devices_device_type",
+        "ix_devices_status",
+        "ix_devices_enabled",
+        "ix_devices_agent_id",
+    }
+    assert expected <= names, f"Missing indexes: {expected - names}"
 
 
 def test_status_history_indexes():
     """Test status history indexes."""
-    indexes = DeviceStatusHistory.__table_args__
-    assert any(index.name == "ix_device_status_history_device_id" for index in indexes)
-    assert any(index.name == "ix_device_status_history_timestamp" for index in indexes)
+    names = {index.name for index in DeviceStatusHistory.__table_args__}
+    expected = {"ix_device_status_history_device_id", "ix_device_status_history_timestamp"}
+    assert expected <= names, f"Missing indexes: {expected - names}"
 
 
 def test_device_metadata_handling():
@@ -3,6 +3,7 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 
+import orjson
 import pytest
 from opmas_mgmt_api.schemas.agents import (
     AgentConfig,
@@ -41,6 +42,7 @@ def test_agent_update():
 @pytest.fixture
 def test_agent_response():
     """Create a test agent response payload."""
+    now = datetime.utcnow().isoformat()
     return {
         "id": str(uuid4()),
         "name": "test-agent",
@@ -52,15 +54,16 @@ def test_agent_response():
         "enabled": True,
         "metadata": {"version": "1.0.0"},
         "config": {"scan_interval": 300},
-        "created_at": datetime.utcnow().isoformat(),
-        "updated_at": datetime.utcnow().isoformat(),
-        "last_seen": datetime.utcnow().isoformat(),
+        "created_at": now,
+        "updated_at": now,
+        "last_seen": now,
     }
 
 
 @pytest.fixture
 def test_agent_list():
     """Create a test agent list payload."""
+    now = datetime.utcnow().isoformat()
     return {
         "items": [
             {
@@ -74,9 +77,9 @@ def test_agent_list():
                 "enabled": True,
                 "metadata": {"version": "1.0.0"},
                 "config": {"scan_interval": 300},
-                "created_at": datetime.utcnow().isoformat(),
-                "updated_at": datetime.utcnow().isoformat(),
-                "last_seen": datetime.utcnow().isoformat(),
+                "created_at": now,
+                "updated_at": now,
+                "last_seen": now,
             },
             {
                 "id": str(uuid4()),
@@ -89,9 +92,9 @@ def test_agent_list():
                 "enabled": True,
                 "metadata": {"version": "1.0.0"},
                 "config": {"scan_interval": 300},
-                "created_at": datetime.utcnow().isoformat(),
-                "updated_at": datetime.utcnow().isoformat(),
-                "last_seen": datetime.utcnow().isoformat(),
+                "created_at": now,
+                "updated_at": now,
+                "last_seen": now,
             },
         ],
         "total": 2,
@@ -139,7 +142,7 @@ def test_agent_discovery():
 
 def test_agent_create_validation(test_agent_create):
     """Test agent creation validation."""
-    agent = AgentCreate(**test_agent_create)
+    agent = AgentCreate.model_validate_json(orjson.dumps(test_agent_create))
     assert agent.name == test_agent_create["name"]
     assert agent.agent_type == test_agent_create["agent_type"]
     assert agent.hostname == test_agent_create["hostname"]
@@ -164,6 +167,33 @@ def test_agent_create_validation_invalid():
         AgentCreate(**invalid_data)
 
 
+_VALID_AGENT_CREATE = {
+    "name": "test-agent",
+    "agent_type": "network",
+    "hostname": "test-agent.local",
+    "ip_address": "192.168.1.100",
+    "port": 8080,
+    "status": "online",
+    "enabled": True,
+}
+
+
+@pytest.mark.parametrize(
+    "override",
+    [
+        {"status": "invalid_status"},
+        {"agent_type": "invalid_type"},
+        {"port": 70000},
+        {"ip_address": "invalid-ip"},
+    ],
+    ids=["status", "agent_type", "port", "ip_address"],
+)
+def test_agent_create_field_validation(override):
+    """Test agent creation rejects a single invalid field."""
+    with pytest.raises(ValidationError):
+        AgentCreate(**{**_VALID_AGENT_CREATE, **override})
+
+
 def test_agent_update_validation(test_agent_update):
     """Test agent update validation."""
     agent = AgentUpdate(**test_agent_update)
@@ -181,7 +211,7 @@ def test_agent_update_validation_invalid():
 
 def test_agent_response_validation(test_agent_response):
     """Test agent response validation."""
-    agent = AgentResponse(**test_agent_response)
+    agent = AgentResponse.model_validate_json(orjson.dumps(test_agent_response))
     assert agent.id == UUID(test_agent_response["id"])
     assert agent.name == test_agent_response["name"]
     assert agent.agent_type == test_agent_response["agent_type"]
@@ -196,7 +226,7 @@ def test_agent_response_validation(test_agent_response):
 
 def test_agent_list_validation(test_agent_list):
     """Test agent list validation."""
-    agent_list = AgentList(**test_agent_list)
+    agent_list = AgentList.model_validate_json(orjson.dumps(test_agent_list))
     assert len(agent_list.items) == len(test_agent_list["items"])
     assert agent_list.total == test_agent_list["total"]
     assert agent_list.skip == test_agent_list["skip"]
@@ -0,0 +1,22 @@
+"""Shared fixtures for service tests."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+
+class NatsStub:
+    """Minimal async NATS manager stub."""
+
+    __slots__ = ("publish", "subscribe", "request")
+
+    def __init__(self):
+        self.publish = AsyncMock(return_value=None)
+        self.subscribe = AsyncMock(return_value=None)
+        self.request = AsyncMock(return_value=None)
+
+
+@pytest.fixture(scope="module")
+def mock_nats():
+    """Create a mock NATS manager shared across a test module."""
+    return NatsStub()
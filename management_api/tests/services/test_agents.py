@@ -1,22 +1,36 @@
 """Test agent management service."""
 
 from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import UUID, uuid4
 
 import pytest
+from _fakes import FakeAgent, FastAsyncSession
 from opmas_mgmt_api.core.exceptions import NotFoundError, ValidationError
-from opmas_mgmt_api.models.agents import Agent, AgentConfigHistory, AgentStatusHistory
 from opmas_mgmt_api.schemas.agents import AgentConfig, AgentCreate, AgentStatus, AgentUpdate
 from opmas_mgmt_api.services.agents import AgentService
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
+_NOW = datetime.utcnow()
 
-@pytest.fixture
+# Deterministic IDs for not-found tests; the mocked session never inspects them
+_MISSING_IDS = [UUID(int=i) for i in range(8)]
+
+_INVALID_AGENT_CREATE_DATA = {
+    "name": "",  # Invalid empty name
+    "agent_type": "invalid",  # Invalid agent type
+    "hostname": "test-agent.local",
+    "ip_address": "invalid-ip",  # Invalid IP address
+    "port": 70000,  # Invalid port
+}
+# Bypass schema validation so the service-side checks are what raise
+_INVALID_AGENT_CREATE = AgentCreate.model_construct(**_INVALID_AGENT_CREATE_DATA)
+_INVALID_AGENT_UPDATE = AgentUpdate.model_construct(agent_type="invalid", port=70000)
+
+
+@pytest.fixture(scope="module")
 def test_agent():
     """Create a test agent."""
-    return Agent(
+    return FakeAgent(
         id=uuid4(),
         name="test-agent",
         agent_type="wifi",
@@ -27,16 +41,16 @@ def test_agent():
         enabled=True,
         metadata={"version": "1.0.0"},
         config={"scan_interval": 300},
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow(),
-        last_seen=datetime.utcnow(),
+        created_at=_NOW,
+        updated_at=_NOW,
+        last_seen=_NOW,
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_agent_create():
     """Create a test agent creation payload."""
-    return AgentCreate(
+    return AgentCreate.model_construct(
         name="test-agent",
         agent_type="wifi",
         hostname="test-agent.local",
@@ -49,26 +63,18 @@ def test_agent_create():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_agent_update():
     """Create a test agent update payload."""
-    return AgentUpdate(name="updated-agent", status="offline", metadata={"version": "1.1.0"})
+    return AgentUpdate.model_construct(
+        name="updated-agent", status="offline", metadata={"version": "1.1.0"}
+    )
 
 
 @pytest.fixture
 def mock_db_session(test_agent):
     """Create a mock database session."""
-    session = AsyncMock(spec=AsyncSession)
-    session.get.return_value = test_agent
-    session.execute.return_value.scalar_one_or_none.return_value = test_agent
-    return session
-
-
-@pytest.fixture
-def mock_nats():
-    """Create a mock NATS manager."""
-    nats = AsyncMock()
-    return nats
+    return FastAsyncSession(test_agent)
 
 
 @pytest.fixture
@@ -77,25 +83,34 @@ def agent_service(mock_db_session, mock_nats):
     return AgentService(mock_db_session, mock_nats)
 
 
-@pytest.mark.asyncio
-async def test_list_agents(agent_service, test_agent):
+@pytest.fixture(scope="module")
+def mock_db_session_ro(test_agent):
+    """Create a mock database session shared by read-only tests."""
+    return FastAsyncSession(test_agent)
+
+
+@pytest.fixture(scope="module")
+def ro_agent_service(mock_db_session_ro, mock_nats):
+    """Create an agent service shared by tests that don't mutate it."""
+    return AgentService(mock_db_session_ro, mock_nats)
+
+
+async def test_list_agents(ro_agent_service, test_agent):
     """Test listing agents."""
-    result = await agent_service.list_agents()
+    result = await ro_agent_service.list_agents()
     assert result.total == 1
     assert len(result.items) == 1
     assert result.items[0].id == test_agent.id
 
 
-@pytest.mark.asyncio
-async def test_list_agents_with_filters(agent_service, test_agent):
+async def test_list_agents_with_filters(ro_agent_service, test_agent):
     """Test listing agents with filters."""
-    result = await agent_service.list_agents(agent_type="wifi", status="online", enabled=True)
+    result = await ro_agent_service.list_agents(agent_type="wifi", status="online", enabled=True)
     assert result.total == 1
     assert len(result.items) == 1
     assert result.items[0].id == test_agent.id
 
 
-@pytest.mark.asyncio
 async def test_create_agent(agent_service, test_agent_create):
     """Test creating an agent."""
     result = await agent_service.create_agent(test_agent_create)
@@ -105,15 +120,13 @@ async def test_create_agent(agent_service, test_agent_create):
     assert result.ip_address == test_agent_create.ip_address
 
 
-@pytest.mark.asyncio
-async def test_get_agent(agent_service, test_agent):
+async def test_get_agent(ro_agent_service, test_agent):
     """Test getting an agent."""
-    result = await agent_service.get_agent(test_agent.id)
+    result = await ro_agent_service.get_agent(test_agent.id)
     assert result.id == test_agent.id
     assert result.name == test_agent.name
 
 
-@pytest.mark.asyncio
 async def test_update_agent(agent_service, test_agent, test_agent_update):
     """Test updating an agent."""
     result = await agent_service.update_agent(test_agent.id, test_agent_update)
@@ -122,7 +135,6 @@ async def test_update_agent(agent_service, test_agent, test_agent_update):
     assert result.metadata == test_agent_update.metadata
 
 
-@pytest.mark.asyncio
 async def test_delete_agent(agent_service, test_agent):
     """Test deleting an agent."""
     await agent_service.delete_agent(test_agent.id)
@@ -130,17 +142,15 @@ async def test_delete_agent(agent_service, test_agent):
     agent_service.db.commit.assert_called_once()
 
 
-@pytest.mark.asyncio
-async def test_get_agent_status(agent_service, test_agent):
+async def test_get_agent_status(ro_agent_service, test_agent):
     """Test getting agent status."""
-    result = await agent_service.get_agent_status(test_agent.id)
+    result = await ro_agent_service.get_agent_status(test_agent.id)
     assert result.status == test_agent.status
     assert result.last_seen == test_agent.last_seen
     assert result.device_status == test_agent.device_status
     assert result.details == test_agent.status_details
 
 
-@pytest.mark.asyncio
 async def test_update_agent_status(agent_service, test_agent):
     """Test updating agent status."""
     status = "offline"
@@ -150,16 +160,14 @@ async def test_update_agent_status(agent_service, test_agent):
     assert result.status_details == details
 
 
-@pytest.mark.asyncio
-async def test_get_agent_config(agent_service, test_agent):
+async def test_get_agent_config(ro_agent_service, test_agent):
     """Test getting agent configuration."""
-    result = await agent_service.get_agent_config(test_agent.id)
+    result = await ro_agent_service.get_agent_config(test_agent.id)
     assert result.config == test_agent.config
     assert result.version == test_agent.config_version
     assert result.last_updated == test_agent.config_updated_at
 
 
-@pytest.mark.asyncio
 async def test_update_agent_config(agent_service, test_agent):
     """Test updating agent configuration."""
     config = {"scan_interval": 600}
@@ -171,67 +179,31 @@ async def test_update_agent_config(agent_service, test_agent):
     assert result.config_metadata == metadata
 
 
-@pytest.mark.asyncio
-async def test_discover_agents(agent_service):
+async def test_discover_agents(ro_agent_service):
     """Test agent discovery."""
-    result = await agent_service.discover_agents()
+    result = await ro_agent_service.discover_agents()
     assert isinstance(result, list)
 
 
-@pytest.mark.asyncio
-async def test_get_nonexistent_agent(agent_service):
-    """Test getting a nonexistent agent."""
-    with pytest.raises(NotFoundError):
-        await agent_service.get_agent(uuid4())
-
-
-@pytest.mark.asyncio
-async def test_update_nonexistent_agent(agent_service, test_agent_update):
-    """Test updating a nonexistent agent."""
+@pytest.mark.parametrize("method", ["get_agent", "update_agent", "delete_agent"])
+async def test_nonexistent_agent_ops(agent_service, test_agent_update, method):
+    """Test operations on a nonexistent agent."""
+    args = (test_agent_update,) if method == "update_agent" else ()
     with pytest.raises(NotFoundError):
-        await agent_service.update_agent(uuid4(), test_agent_update)
-
-
-@pytest.mark.asyncio
-async def test_delete_nonexistent_agent(agent_service):
-    """Test deleting a nonexistent agent."""
-    with pytest.raises(NotFoundError):
-        await agent_service.delete_agent(uuid4())
-
-
-@pytest.mark.asyncio
-async def test_create_agent_validation(agent_service):
-    """Test agent creation validation."""
-    invalid_agent = AgentCreate(
-        name="",  # Invalid empty name
-        agent_type="invalid",  # Invalid agent type
-        hostname="test-agent.local",
-        ip_address="invalid-ip",  # Invalid IP address
-        port=70000,  # Invalid port
-    )
-    with pytest.raises(ValidationError):
-        await agent_service.create_agent(invalid_agent)
-
-
-@pytest.mark.asyncio
-async def test_update_agent_validation(agent_service, test_agent):
-    """Test agent update validation."""
-    invalid_update = AgentUpdate(
-        agent_type="invalid", port=70000  # Invalid agent type  # Invalid port
-    )
-    with pytest.raises(ValidationError):
-        await agent_service.update_agent(test_agent.id, invalid_update)
-
-
-@pytest.mark.asyncio
-async def test_update_agent_status_validation(agent_service, test_agent):
-    """Test agent status update validation."""
-    with pytest.raises(ValidationError):
-        await agent_service.update_agent_status(test_agent.id, "invalid_status")
-
-
-@pytest.mark.asyncio
-async def test_update_agent_config_validation(agent_service, test_agent):
-    """Test agent config update validation."""
+        await getattr(agent_service, method)(_MISSING_IDS[0], *args)
+
+
+@pytest.mark.parametrize(
+    "method, make_args",
+    [
+        ("create_agent", lambda agent: (_INVALID_AGENT_CREATE,)),
+        ("update_agent", lambda agent: (agent.id, _INVALID_AGENT_UPDATE)),
+        ("update_agent_status", lambda agent: (agent.id, "invalid_status")),
+        ("update_agent_config", lambda agent: (agent.id, {}, "", {})),
+    ],
+    ids=["create", "update", "update_status", "update_config"],
+)
+async def test_agent_validation_errors(agent_service, test_agent, method, make_args):
+    """Test agent service validation."""
     with pytest.raises(ValidationError):
-        await agent_service.update_agent_config(test_agent.id, {}, "", {})
+        await getattr(agent_service, method)(*make_args(test_agent))
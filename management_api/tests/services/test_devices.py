@@ -1,21 +1,27 @@
 """Test device management service."""
 
+from dataclasses import replace
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID, uuid4
 
 import pytest
-from opmas_mgmt_api.core.exceptions import NotFoundError, ValidationError
-from opmas_mgmt_api.models.devices import Device, DeviceStatusHistory
+from _fakes import FakeDevice, FastAsyncSession
+from opmas_mgmt_api.core.exceptions import OPMASException, ResourceNotFoundError, ValidationError
 from opmas_mgmt_api.schemas.devices import DeviceCreate, DeviceStatus, DeviceUpdate
 from opmas_mgmt_api.services.devices import DeviceService
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 
+_NOW = datetime.utcnow()
 
-@pytest.fixture
+# Deterministic IDs for not-found tests; the mocked session never inspects them
+_MISSING_IDS = [UUID(int=i) for i in range(8)]
+
+
+@pytest.fixture(scope="module")
 def test_device():
     """Create a test device."""
-    return Device(
+    return FakeDevice(
         id=uuid4(),
         hostname="test-device",
         ip_address="192.168.1.1",
@@ -25,16 +31,16 @@ def test_device():
         status="online",
         enabled=True,
         metadata={"location": "test-location"},
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow(),
-        last_seen=datetime.utcnow(),
+        created_at=_NOW,
+        updated_at=_NOW,
+        last_seen=_NOW,
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_device_create():
     """Create a test device creation payload."""
-    return DeviceCreate(
+    return DeviceCreate.model_construct(
         hostname="test-device",
         ip_address="192.168.1.1",
         device_type="router",
@@ -46,10 +52,10 @@ def test_device_create():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_device_update():
     """Create a test device update payload."""
-    return DeviceUpdate(
+    return DeviceUpdate.model_construct(
         hostname="updated-device", status="offline", metadata={"location": "new-location"}
     )
 
@@ -57,17 +63,13 @@ def test_device_update():
 @pytest.fixture
 def mock_db_session(test_device):
     """Create a mock database session."""
-    session = AsyncMock(spec=AsyncSession)
-    session.get.return_value = test_device
-    session.execute.return_value.scalar_one_or_none.return_value = test_device
-    return session
+    return FastAsyncSession(test_device)
 
 
 @pytest.fixture
-def mock_nats():
-    """Create a mock NATS manager."""
-    nats = AsyncMock()
-    return nats
+def empty_db_session():
+    """Create a mock database session that holds no devices."""
+    return FastAsyncSession(None)
 
 
 @pytest.fixture
@@ -76,55 +78,97 @@ def device_service(mock_db_session, mock_nats):
     return DeviceService(mock_db_session, mock_nats)
 
 
-async def test_list_devices(device_service, test_device):
+@pytest.fixture(scope="module")
+def mock_db_session_ro(test_device):
+    """Create a mock database session shared by read-only tests."""
+    return FastAsyncSession(test_device)
+
+
+@pytest.fixture(scope="module")
+def ro_device_service(mock_db_session_ro, mock_nats):
+    """Create a device service shared by tests that don't mutate it."""
+    return DeviceService(mock_db_session_ro, mock_nats)
+
+
+async def test_list_devices(ro_device_service, test_device):
     """Test listing devices."""
-    result = await device_service.list_devices()
+    result = await ro_device_service.list_devices()
     assert "items" in result
     assert "total" in result
     assert "skip" in result
     assert "limit" in result
 
 
-async def test_list_devices_with_filters(device_service, test_device):
+async def test_list_devices_with_filters(ro_device_service, test_device):
     """Test listing devices with filters."""
-    result = await device_service.list_devices(device_type="router", status="online", enabled=True)
+    result = await ro_device_service.list_devices(
+        device_type="router", status="online", enabled=True
+    )
     assert "items" in result
     assert "total" in result
 
 
-async def test_get_device(device_service, test_device):
+async def test_get_device(ro_device_service, test_device):
     """Test getting a device."""
-    device = await device_service.get_device(test_device.id)
+    device = await ro_device_service.get_device(test_device.id)
     assert device.id == test_device.id
     assert device.hostname == test_device.hostname
 
 
 async def test_get_nonexistent_device(device_service):
     """Test getting a nonexistent device."""
-    with pytest.raises(NotFoundError):
-        await device_service.get_device(uuid4())
+    with pytest.raises(ResourceNotFoundError):
+        await device_service.get_device(_MISSING_IDS[0])
 
 
-async def test_create_device(device_service, test_device_create):
+async def test_create_device(empty_db_session, mock_nats, test_device_create):
     """Test creating a device."""
+    device_service = DeviceService(empty_db_session, mock_nats)
     device = await device_service.create_device(test_device_create)
     assert device.hostname == test_device_create.hostname
     assert device.ip_address == test_device_create.ip_address
     assert device.device_type == test_device_create.device_type
 
 
-async def test_create_device_duplicate_hostname(device_service, test_device, test_device_create):
-    """Test creating a device with duplicate hostname."""
-    device_service.db.execute.return_value.scalar_one_or_none.return_value = test_device
+@pytest.mark.parametrize(
+    "conflict",
+    [{"ip_address": "192.168.1.99"}, {"hostname": "other-device"}],
+    ids=["duplicate_hostname", "duplicate_ip"],
+)
+async def test_create_device_duplicate(mock_nats, test_device, test_device_create, conflict):
+    """Test creating a device whose hostname or IP address is already taken."""
+    # Change the other field so the stored device clashes only on the one under test
+    service = DeviceService(FastAsyncSession(replace(test_device, **conflict)), mock_nats)
     with pytest.raises(ValidationError):
-        await device_service.create_device(test_device_create)
+        await service.create_device(test_device_create)
 
 
-async def test_create_device_duplicate_ip(device_service, test_device, test_device_create):
-    """Test creating a device with duplicate IP address."""
-    device_service.db.execute.return_value.scalar_one_or_none.return_value = test_device
-    with pytest.raises(ValidationError):
-        await device_service.create_device(test_device_create)
+async def test_commit_device(empty_db_session, test_device_create):
+    """Test committing a device caches and publishes its status after the commit."""
+    nats, redis = AsyncMock(), AsyncMock()
+    service = DeviceService(empty_db_session, nats)
+
+    device = await service.commit_device(test_device_create, redis)
+
+    empty_db_session.commit.assert_awaited_once()
+    redis.hset.assert_awaited_once()
+    assert redis.hset.call_args[0][0] == f"device:status:{device.id}"
+    nats.publish.assert_awaited_once()
+    assert nats.publish.call_args[0][0] == f"device.status.{device.id}"
+
+
+async def test_commit_device_commit_failure(empty_db_session, test_device_create):
+    """Test a failed commit leaves no status in Redis and publishes nothing."""
+    nats, redis = AsyncMock(), AsyncMock()
+    empty_db_session.commit.side_effect = IntegrityError(None, None, None)
+    service = DeviceService(empty_db_session, nats)
+
+    with pytest.raises(OPMASException):
+        await service.commit_device(test_device_create, redis)
+
+    empty_db_session.rollback.assert_awaited_once()
+    redis.hset.assert_not_awaited()
+    nats.publish.assert_not_awaited()
 
 
 async def test_update_device(device_service, test_device, test_device_update):
@@ -136,8 +180,8 @@ async def test_update_device(device_service, test_device, test_device_update):
 
 async def test_update_nonexistent_device(device_service, test_device_update):
     """Test updating a nonexistent device."""
-    with pytest.raises(NotFoundError):
-        await device_service.update_device(uuid4(), test_device_update)
+    with pytest.raises(ResourceNotFoundError):
+        await device_service.update_device(_MISSING_IDS[1], test_device_update)
 
 
 async def test_delete_device(device_service, test_device):
@@ -148,13 +192,13 @@ async def test_delete_device(device_service, test_device):
 
 async def test_delete_nonexistent_device(device_service):
     """Test deleting a nonexistent device."""
-    with pytest.raises(NotFoundError):
-        await device_service.delete_device(uuid4())
+    with pytest.raises(ResourceNotFoundError):
+        await device_service.delete_device(_MISSING_IDS[2])
 
 
-async def test_get_device_status(device_service, test_device):
+async def test_get_device_status(ro_device_service, test_device):
     """Test getting device status."""
-    status = await device_service.get_device_status(test_device.id)
+    status = await ro_device_service.get_device_status(test_device.id)
     assert isinstance(status, DeviceStatus)
     assert status.status == test_device.status
     assert status.last_seen == test_device.last_seen
@@ -162,8 +206,8 @@ async def test_get_device_status(device_service, test_device):
 
 async def test_get_nonexistent_device_status(device_service):
     """Test getting status for nonexistent device."""
-    with pytest.raises(NotFoundError):
-        await device_service.get_device_status(uuid4())
+    with pytest.raises(ResourceNotFoundError):
+        await device_service.get_device_status(_MISSING_IDS[3])
 
 
 async def test_update_device_status(device_service, test_device):
@@ -176,11 +220,11 @@ async def test_update_device_status(device_service, test_device):
 
 async def test_update_nonexistent_device_status(device_service):
     """Test updating status for nonexistent device."""
-    with pytest.raises(NotFoundError):
-        await device_service.update_device_status(uuid4(), "offline")
+    with pytest.raises(ResourceNotFoundError):
+        await device_service.update_device_status(_MISSING_IDS[4], "offline")
 
 
-async def test_discover_devices(device_service):
+async def test_discover_devices(ro_device_service):
     """Test device discovery."""
-    devices = await device_service.discover_devices()
+    devices = await ro_device_service.discover_devices()
     assert isinstance(devices, list)
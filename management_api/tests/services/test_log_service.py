@@ -1,9 +1,12 @@
 """Test log service."""
 
+import json
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 import pytest
+from _fakes import FakeResult
 from opmas_mgmt_api.core.exceptions import OPMASException
 from opmas_mgmt_api.models.logs import LogEntry, LogSource
 from opmas_mgmt_api.schemas.logs import LogEntryCreate, LogSourceCreate
@@ -11,6 +14,8 @@ from opmas_mgmt_api.services.logs import LogService
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
 
 @pytest.fixture
 def mock_db():
@@ -49,18 +54,18 @@ def sample_source():
         id=1,
         identifier="test-source",
         ip_address="192.168.1.1",
-        first_seen=datetime.utcnow(),
-        last_seen=datetime.utcnow(),
+        first_seen=_NOW,
+        last_seen=_NOW,
     )
 
 
 @pytest.mark.asyncio
-async def test_process_logs_success(log_service, sample_logs):
+async def test_process_logs_success(log_service, sample_logs, sample_source):
     """Test successful log processing."""
     # Mock database operations
     log_service._get_or_create_source = AsyncMock(return_value=sample_source)
-    log_service._save_log_entry = AsyncMock()
-    log_service._publish_log = AsyncMock()
+    log_service._save_log_entries_bulk = AsyncMock()
+    log_service._publish_logs_batch = AsyncMock()
 
     processed_count = await log_service.process_logs(
         logs=sample_logs, source_identifier="test-source", source_ip="192.168.1.1"
@@ -68,8 +73,10 @@ async def test_process_logs_success(log_service, sample_logs):
 
     assert processed_count == 3
     assert log_service._get_or_create_source.call_count == 1
-    assert log_service._save_log_entry.call_count == 3
-    assert log_service._publish_log.call_count == 3
+    assert log_service._save_log_entries_bulk.call_count == 1
+    assert len(log_service._save_log_entries_bulk.call_args[0][0]) == 3
+    assert log_service._publish_logs_batch.call_count == 1
+    assert len(log_service._publish_logs_batch.call_args[0][0]) == 3
 
 
 @pytest.mark.asyncio
@@ -98,16 +105,47 @@ async def test_process_logs_db_error(log_service, sample_logs):
 
 
 @pytest.mark.asyncio
-async def test_process_logs_nats_error(log_service, sample_logs):
+async def test_process_logs_nats_error(log_service, sample_logs, sample_source):
     """Test log processing with NATS error."""
     log_service._get_or_create_source = AsyncMock(return_value=sample_source)
-    log_service._save_log_entry = AsyncMock()
-    log_service._publish_log = AsyncMock(side_effect=Exception("NATS error"))
+    log_service._save_log_entries_bulk = AsyncMock()
+    log_service._publish_logs_batch = AsyncMock(side_effect=Exception("NATS error"))
 
     processed_count = await log_service.process_logs(logs=sample_logs)
     assert processed_count == 0
 
 
+@pytest.mark.asyncio
+async def test_process_logs_publish_error_keeps_committed_rows(
+    log_service, sample_logs, sample_source
+):
+    """Test that a failed publish reports zero processed but keeps the saved rows."""
+    log_service._get_or_create_source = AsyncMock(return_value=sample_source)
+    log_service.nats.publish.side_effect = Exception("NATS error")
+
+    processed_count = await log_service.process_logs(logs=sample_logs)
+
+    assert processed_count == 0
+    assert len(log_service.db.add_all.call_args[0][0]) == len(sample_logs)
+    assert log_service.db.commit.called
+    assert not log_service.db.rollback.called
+
+
+@pytest.mark.asyncio
+async def test_process_logs_bulk_insert_error(log_service, sample_logs, sample_source):
+    """Test that one rejected row or a failed commit rolls back the whole batch."""
+    log_service._get_or_create_source = AsyncMock(return_value=sample_source)
+    log_service.db.commit.side_effect = IntegrityError(None, None, None)
+
+    with pytest.raises(OPMASException, match="Failed to process logs"):
+        await log_service.process_logs(logs=sample_logs)
+
+    assert log_service.db.add_all.call_count == 1
+    assert len(log_service.db.add_all.call_args[0][0]) == len(sample_logs)
+    assert log_service.db.rollback.called
+    assert not log_service.nats.publish.called
+
+
 @pytest.mark.asyncio
 async def test_get_or_create_source_new(log_service):
     """Test creating new log source."""
@@ -155,6 +193,39 @@ def test_parse_log_syslog_format(log_service):
     assert "failed for lonvick" in parsed["message"]
 
 
+def test_parse_log_syslog_tab_separated(log_service):
+    """Test parsing syslog fields separated by tabs."""
+    log_entry = "<13>Feb  5 17:32:18\thost\tprog: msg"
+
+    parsed = log_service._parse_log(log_entry)
+
+    assert parsed["hostname"] == "host"
+    assert parsed["program"] == "prog"
+    assert parsed["message"] == "msg"
+
+
+@pytest.mark.parametrize(
+    "log_entry",
+    [
+        "<34>1 2003-10-11T22:14:15.003Z mymachine.example.com su - ID47 - ...: for lonvick",
+        "<13> Feb 5 17:32:18 host prog: msg",
+        "<13>Foo 5 17:32:18 host prog: msg",
+        "<13>Feb 123 17:32:18 host prog: msg",
+        "<13>Feb 5 17:32 host prog: msg",
+        "<13>Feb 5 17:32:18 host",
+        "<x>Feb 5 17:32:18 host prog: msg",
+    ],
+    ids=["rfc5424", "space-after-pri", "month", "day", "time", "truncated", "pri"],
+)
+def test_parse_log_malformed_syslog_falls_back_to_raw(log_service, log_entry):
+    """Test that lines not in RFC 3164 layout are kept whole as raw messages."""
+    parsed = log_service._parse_log(log_entry)
+
+    assert parsed["hostname"] is None
+    assert parsed["program"] is None
+    assert parsed["message"] == log_entry
+
+
 def test_parse_log_raw_format(log_service):
     """Test parsing raw format log."""
     log_entry = "This is a raw log message"
@@ -173,7 +244,7 @@ async def test_save_log_entry(log_service):
     """Test saving log entry."""
     log_entry = LogEntryCreate(
         source_id=1,
-        timestamp=datetime.utcnow(),
+        timestamp=_NOW,
         level=6,
         facility=1,
         message="Test message",
@@ -193,7 +264,7 @@ async def test_save_log_entry(log_service):
 async def test_publish_log(log_service, sample_source):
     """Test publishing log to NATS."""
     log_data = {
-        "timestamp": datetime.utcnow(),
+        "timestamp": _NOW,
         "level": 6,
         "facility": 1,
         "hostname": "test-host",
@@ -206,21 +277,46 @@ async def test_publish_log(log_service, sample_source):
     assert log_service.nats.publish.called
     call_args = log_service.nats.publish.call_args
     assert call_args[0][0] == "logs.ingested"
-    published_data = eval(call_args[0][1])  # Convert JSON string back to dict
+    published_data = json.loads(call_args[0][1])
     assert published_data["level"] == log_data["level"]
     assert published_data["message"] == log_data["message"]
     assert published_data["source"]["id"] == sample_source.id
 
 
+@pytest.mark.asyncio
+async def test_publish_logs_batch(log_service, sample_source):
+    """Test publishing a batch of logs to NATS in one message."""
+    log_data = {
+        "timestamp": _NOW,
+        "level": 6,
+        "facility": 1,
+        "hostname": "test-host",
+        "program": "test-program",
+        "message": "Test message",
+    }
+
+    await log_service._publish_logs_batch([(log_data, sample_source)] * 3)
+
+    assert log_service.nats.publish.call_count == 1
+    call_args = log_service.nats.publish.call_args
+    assert call_args[0][0] == "logs.ingested.batch"
+    published_data = json.loads(call_args[0][1])
+    assert len(published_data) == 3
+    assert published_data[0]["message"] == log_data["message"]
+    assert published_data[0]["source"]["id"] == sample_source.id
+
+
 @pytest.mark.asyncio
 async def test_get_status(log_service):
     """Test getting service status."""
     # Mock database query results
-    mock_result = MagicMock()
-    mock_result.total_logs = 100
-    mock_result.first_log = datetime.utcnow() - timedelta(days=1)
-    mock_result.last_log = datetime.utcnow()
-    log_service.db.execute.return_value.first.return_value = mock_result
+    log_service.db.execute.return_value = FakeResult(
+        row=SimpleNamespace(
+            total_logs=100,
+            first_log=_NOW - timedelta(days=1),
+            last_log=_NOW,
+        )
+    )
 
     status = await log_service.get_status()
 
@@ -234,46 +330,46 @@ async def test_get_status(log_service):
 async def test_get_statistics(log_service):
     """Test getting log statistics."""
     # Mock database query results
-    mock_total = MagicMock()
-    mock_total.scalar_one.return_value = 100
-    log_service.db.execute.return_value.scalar_one.return_value = 100
-
-    mock_source_stats = [
-        MagicMock(identifier="source1", count=60),
-        MagicMock(identifier="source2", count=40),
+    log_service.db.scalar.return_value = 100
+    log_service.db.execute.side_effect = [
+        FakeResult(rows=[SimpleNamespace(level="error", count=5)]),
+        FakeResult(
+            rows=[
+                SimpleNamespace(identifier="source1", count=60),
+                SimpleNamespace(identifier="source2", count=40),
+            ]
+        ),
     ]
-    log_service.db.execute.return_value = mock_source_stats
 
-    start_time = datetime.utcnow() - timedelta(days=1)
-    end_time = datetime.utcnow()
+    start_time = _NOW - timedelta(days=1)
+    end_time = _NOW
+    expected_start = start_time.isoformat()
+    expected_end = end_time.isoformat()
 
     stats = await log_service.get_statistics(start_time, end_time)
 
     assert stats["total_logs"] == 100
-    assert "source_stats" in stats
-    assert "time_range" in stats
-    assert stats["time_range"]["start"] == start_time.isoformat()
-    assert stats["time_range"]["end"] == end_time.isoformat()
+    assert stats["source_stats"] == {"source1": 60, "source2": 40}
+    assert stats["time_range"] == {"start": expected_start, "end": expected_end}
 
 
 @pytest.mark.asyncio
 async def test_get_statistics_no_time_range(log_service):
     """Test getting log statistics without time range."""
     # Mock database query results
-    mock_total = MagicMock()
-    mock_total.scalar_one.return_value = 100
-    log_service.db.execute.return_value.scalar_one.return_value = 100
-
-    mock_source_stats = [
-        MagicMock(identifier="source1", count=60),
-        MagicMock(identifier="source2", count=40),
+    log_service.db.scalar.return_value = 100
+    log_service.db.execute.side_effect = [
+        FakeResult(),
+        FakeResult(
+            rows=[
+                SimpleNamespace(identifier="source1", count=60),
+                SimpleNamespace(identifier="source2", count=40),
+            ]
+        ),
     ]
-    log_service.db.execute.return_value = mock_source_stats
 
     stats = await log_service.get_statistics()
 
     assert stats["total_logs"] == 100
-    assert "source_stats" in stats
-    assert "time_range" in stats
-    assert stats["time_range"]["start"] is None
-    assert stats["time_range"]["end"] is None
+    assert stats["source_stats"] == {"source1": 60, "source2": 40}
+    assert stats["time_range"] == {"start": None, "end": None}
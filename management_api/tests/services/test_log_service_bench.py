@@ -0,0 +1,30 @@
+"""Benchmark log service parsing."""
+
+import pytest
+from _fakes import FastAsyncSession
+from opmas_mgmt_api.services.logs import LogService
+
+pytest.importorskip("pytest_benchmark")
+
+_SAMPLE_LOGS = [
+    "<34>Oct 11 22:14:15 mymachine su: 'su root' failed for lonvick on /dev/pts/8",
+    "<165>Oct 11 22:14:15 mymachine auth: Authentication failure",
+    "This is a raw log message",
+]
+
+
+@pytest.fixture(scope="module")
+def log_service(mock_nats):
+    """Create log service instance."""
+    return LogService(FastAsyncSession(None), mock_nats)
+
+
+def test_parse_log_bench(benchmark, log_service):
+    """Benchmark parsing a mixed batch of syslog and raw lines."""
+    lines = _SAMPLE_LOGS * 4000
+
+    parsed = benchmark.pedantic(
+        lambda: [log_service._parse_log(line) for line in lines], rounds=5, iterations=1
+    )
+
+    assert len(parsed) == len(lines)
@@ -1,9 +1,10 @@
 """Test system management service."""
 
 from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from _fakes import FakeResult
 from opmas_mgmt_api.models.system import SystemConfig
 from opmas_mgmt_api.schemas.system import SystemConfig as SystemConfigSchema
 from opmas_mgmt_api.schemas.system import (
@@ -17,6 +18,8 @@ from opmas_mgmt_api.services.system import SystemService
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
 
 @pytest.fixture
 def mock_db():
@@ -52,8 +55,8 @@ def test_system_config():
         components={"database": {"pool_size": 10}, "nats": {"max_reconnects": 5}},
         security={"jwt_secret": "test-secret", "token_expiry": 3600},
         logging={"level": "INFO", "format": "json"},
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow(),
+        created_at=_NOW,
+        updated_at=_NOW,
     )
 
 
@@ -88,7 +91,7 @@ async def test_get_system_metrics(system_service):
 
 async def test_get_system_config(system_service, test_system_config):
     """Test getting system config."""
-    system_service.db.execute.return_value.scalar_one_or_none.return_value = test_system_config
+    system_service.db.execute.return_value = FakeResult(value=test_system_config)
 
     config = await system_service.get_system_config()
     assert isinstance(config, SystemConfigSchema)
@@ -101,7 +104,7 @@ async def test_get_system_config(system_service, test_system_config):
 
 async def test_get_system_config_default(system_service):
     """Test getting default system config."""
-    system_service.db.execute.return_value.scalar_one_or_none.return_value = None
+    system_service.db.execute.return_value = FakeResult()
 
     config = await system_service.get_system_config()
     assert isinstance(config, SystemConfigSchema)
@@ -0,0 +1,26 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from opmas_mgmt_api.main import app
+
+# Health and metrics need neither the test database nor a get_db override
+
+
+@pytest.fixture(scope="module")
+async def client():
+    """Create an async test client without database setup."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+async def test_health_check(client):
+    response = await client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
+
+async def test_metrics_endpoint(client):
+    # Make sure at least one request has been counted, whatever the test order
+    await client.get("/health")
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text
@@ -1,32 +1,64 @@
 """Integration tests for core backend connectivity."""
 
 import asyncio
+from dataclasses import dataclass
+from uuid import uuid4
 
 import nats
+import orjson
 import pytest
 import pytest_asyncio
-import redis
-from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 from opmas_mgmt_api.config import get_settings
-from opmas_mgmt_api.db.session import db_manager
+from opmas_mgmt_api.db.session import engine
 from opmas_mgmt_api.main import app
+from opmas_mgmt_api.security import RedisRateLimiter
 from opmas_mgmt_api.services.nats import nats_manager
+from redis import asyncio as aioredis
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 settings = get_settings()
 
+# Constant liveness query, built once
+_PING = text("SELECT 1")
 
-@pytest.fixture(scope="session")
-def client():
-    """Create test client."""
-    return TestClient(app)
 
+@dataclass(slots=True)
+class DeviceStatusMessage:
+    """Device status update published on ``device.status.<id>``."""
 
-@pytest.fixture(scope="session")
+    device_id: str
+    status: str
+    timestamp: str
+
+
+async def publish_many(nc, pairs):
+    """Publish (subject, payload) pairs in one batch, leaving the flush to the client."""
+    await asyncio.gather(*(nc.publish(subject, data) for subject, data in pairs))
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """Create async test client whose app lifespan runs once per session."""
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+            yield c
+
+
+@pytest.fixture
 def db():
-    """Create test database session."""
-    with db_manager.get_session() as session:
+    """Create test database session rolled back after each test."""
+    connection = engine.connect()
+    trans = connection.begin()
+    # Commits inside the test release a savepoint instead of the outer transaction
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
         yield session
+    finally:
+        session.close()
+        trans.rollback()
+        connection.close()
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -39,17 +71,30 @@ async def nats_client():
         await nc.close()
 
 
-@pytest.fixture(scope="session")
-def redis_client():
-    """Create test Redis client."""
-    client = redis.Redis.from_url(settings.redis_url)
-    yield client
-    client.close()
+@pytest_asyncio.fixture(scope="session")
+async def redis_client():
+    """Create test Redis client backed by a shared connection pool."""
+    client = aioredis.Redis.from_url(settings.redis_url, max_connections=64, decode_responses=True)
+    try:
+        yield client
+    finally:
+        await client.aclose()
+
+
+@pytest_asyncio.fixture
+async def redis_prefix(redis_client):
+    """Yield a per-test Redis key prefix and drop its keys afterwards."""
+    prefix = f"test:{uuid4().hex}:"
+    yield prefix
+    keys = [key async for key in redis_client.scan_iter(f"{prefix}*")]
+    if keys:
+        await redis_client.delete(*keys)
 
 
-def test_health_check(client):
+@pytest.mark.asyncio
+async def test_health_check(client):
     """Test health check endpoint."""
-    response = client.get("/health")
+    response = await client.get("/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
@@ -61,7 +106,7 @@ def test_health_check(client):
 def test_database_connection(db: Session):
     """Test database connection."""
     # Try to execute a simple query
-    result = db.execute("SELECT 1").scalar()
+    result = db.execute(_PING).scalar()
     assert result == 1
 
 
@@ -70,75 +115,90 @@ async def test_nats_connection(nats_client):
     """Test NATS connection."""
     # Create a test subject
     test_subject = "test.subject"
-    test_message = b"Test message"
-
-    # Create a future to wait for the message
-    future = asyncio.Future()
+    test_messages = [f"Test message {i}".encode() for i in range(16)]
 
     # Subscribe to the test subject
-    async def message_handler(msg):
-        future.set_result(msg.data)
+    sub = await nats_client.subscribe(test_subject)
 
-    await nats_client.subscribe(test_subject, cb=message_handler)
+    try:
+        # Publish the test messages as a single batch
+        await publish_many(nats_client, [(test_subject, message) for message in test_messages])
 
-    # Publish a test message
-    await nats_client.publish(test_subject, test_message)
+        # Wait for every message to be received
+        received = [(await sub.next_msg(timeout=5.0)).data for _ in test_messages]
+    finally:
+        await sub.unsubscribe()
 
-    # Wait for the message to be received
-    received_message = await asyncio.wait_for(future, timeout=5.0)
-    assert received_message == test_message
+    assert sorted(received) == sorted(test_messages)
 
 
-def test_redis_connection(redis_client):
+@pytest.mark.asyncio
+async def test_redis_connection(redis_client, redis_prefix):
     """Test Redis connection."""
     # Test key
-    test_key = "test:key"
+    test_key = f"{redis_prefix}key"
     test_value = "test_value"
 
     # Set and get value
-    redis_client.set(test_key, test_value)
-    retrieved_value = redis_client.get(test_key)
-    assert retrieved_value.decode() == test_value
+    await redis_client.set(test_key, test_value)
+    retrieved_value = await redis_client.get(test_key)
+    assert retrieved_value == test_value
+
 
-    # Clean up
-    redis_client.delete(test_key)
+@pytest.mark.asyncio
+async def test_redis_rate_limiting(redis_prefix):
+    """Test Redis-backed rate limiting."""
+    rate_limiter = RedisRateLimiter.from_url(
+        settings.redis_url, requests_per_minute=2, key_prefix=f"{redis_prefix}rl"
+    )
+
+    try:
+        assert not await rate_limiter.is_rate_limited("127.0.0.1")
+        assert not await rate_limiter.is_rate_limited("127.0.0.1")
+        assert await rate_limiter.is_rate_limited("127.0.0.1")
+    finally:
+        await rate_limiter.redis.aclose()
 
 
 @pytest.mark.asyncio
 async def test_integrated_workflow(client, db: Session, nats_client, redis_client):
     """Test integrated workflow using all three services."""
-    # 1. Create a test device via API
+    sub = await nats_client.subscribe("device.status.*")
+
+    # 1. Create the device, cache its status and publish it in one call
     device_data = {
         "hostname": "test-device",
         "ip_address": "192.168.1.2",
         "device_type": "sensor",
+        "model": "test-model",
+        "firmware_version": "1.0.0",
         "status": "active",
     }
-    response = client.post("/api/v1/devices", json=device_data)
-    assert response.status_code == 200
+    response = await client.post("/api/v1/devices:commit", json=device_data)
+    assert response.status_code == 201
     device = response.json()
     assert device["hostname"] == device_data["hostname"]
-
-    # 2. Store device status in Redis
     device_key = f"device:status:{device['id']}"
-    redis_client.hset(device_key, mapping={"status": "active", "last_seen": "2024-03-20T12:00:00Z"})
 
-    # 3. Publish device status update via NATS
-    status_subject = f"device.status.{device['id']}"
-    status_message = {
-        "device_id": device["id"],
-        "status": "active",
-        "timestamp": "2024-03-20T12:00:00Z",
-    }
-    await nats_client.publish(status_subject, str(status_message).encode())
-
-    # 4. Verify device status via API
-    response = client.get(f"/api/v1/devices/{device['id']}/status")
-    assert response.status_code == 200
-    status = response.json()
-    assert status["status"] == "active"
-
-    # 5. Clean up
-    response = client.delete(f"/api/v1/devices/{device['id']}")
-    assert response.status_code == 200
-    redis_client.delete(device_key)
+    try:
+        # 2. Verify the status update was published via NATS
+        msg = await sub.next_msg(timeout=1)
+        status_message = DeviceStatusMessage(**orjson.loads(msg.data))
+        assert status_message.device_id == device["id"]
+        assert status_message.status == "active"
+
+        # 3. Verify device status was cached in Redis
+        assert await redis_client.hget(device_key, "status") == "active"
+
+        # 4. Verify device status via API
+        response = await client.get(f"/api/v1/devices/{device['id']}/status")
+        assert response.status_code == 200
+        status = response.json()
+        assert status["status"] == "active"
+
+        # 5. Delete the device via API
+        response = await client.delete(f"/api/v1/devices/{device['id']}")
+        assert response.status_code == 204
+    finally:
+        await sub.unsubscribe()
+        await redis_client.delete(device_key)
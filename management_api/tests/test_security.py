@@ -1,10 +1,25 @@
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 from opmas_mgmt_api.core.exceptions import OPMASException
 from opmas_mgmt_api.main import app
 from opmas_mgmt_api.security import InputValidator, RateLimiter
 
-client = TestClient(app)
+
+@pytest.fixture(scope="session")
+def client():
+    """Create a test client whose app lifespan runs once for the session."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="module")
+async def async_client():
+    """Create an async test client shared across the module."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
 
 
 def test_rate_limiting():
@@ -22,7 +37,7 @@ def test_rate_limiting():
     assert rate_limiter.is_rate_limited(client_ip)
 
 
-def test_security_headers():
+def test_security_headers(client):
     response = client.get("/health")
     headers = response.headers
 
@@ -35,62 +50,127 @@ def test_security_headers():
     assert "Referrer-Policy" in headers
 
 
-def test_input_validation():
-    validator = InputValidator()
-
-    # Test IP address validation
-    assert validator.validate_ip_address("192.168.1.1")
-    assert not validator.validate_ip_address("256.168.1.1")
-    assert not validator.validate_ip_address("192.168.1")
-    assert not validator.validate_ip_address("192.168.1.1.1")
-
-    # Test hostname validation
-    assert validator.validate_hostname("example.com")
-    assert validator.validate_hostname("sub.example.com")
-    assert not validator.validate_hostname("invalid hostname")
-    assert not validator.validate_hostname("example.com/")
-
-    # Test input sanitization
+@pytest.fixture(scope="module")
+def validator():
+    """Create an input validator shared across the module."""
+    return InputValidator()
+
+
+@pytest.mark.parametrize(
+    "ip,ok",
+    [
+        ("192.168.1.1", True),
+        ("256.168.1.1", False),
+        ("192.168.1", False),
+        ("192.168.1.1.1", False),
+    ],
+)
+def test_validate_ip_address(validator, ip, ok):
+    assert validator.validate_ip_address(ip) is ok
+
+
+@pytest.mark.parametrize(
+    "hostname,ok",
+    [
+        ("example.com", True),
+        ("sub.example.com", True),
+        ("invalid hostname", False),
+        ("example.com/", False),
+        ("host\n", False),  # Trailing newline
+        ("a" * 254, False),  # Longer than 253 characters
+    ],
+)
+def test_validate_hostname(validator, hostname, ok):
+    assert validator.validate_hostname(hostname) is ok
+
+
+def test_sanitize_input(validator):
     input_str = "<script>alert('xss')</script>"
     sanitized = validator.sanitize_input(input_str)
     assert "<script>" not in sanitized
     assert "alert" not in sanitized
 
 
-def test_json_schema_validation():
-    validator = InputValidator()
-    schema = {"name": str, "age": int, "active": bool}
-
-    # Valid data
-    valid_data = {"name": "John", "age": 30, "active": True}
-    assert validator.validate_json_schema(valid_data, schema)
-
-    # Invalid data
-    invalid_data = {"name": "John", "age": "30", "active": True}  # Should be int
-    assert not validator.validate_json_schema(invalid_data, schema)
-
-
-def test_error_handling():
+_PERSON_SCHEMA = {"name": str, "age": int, "active": bool}
+
+
+@pytest.mark.parametrize(
+    "data,ok",
+    [
+        ({"name": "John", "age": 30, "active": True}, True),
+        ({"name": "John", "age": "30", "active": True}, False),  # Should be int
+    ],
+    ids=["valid", "wrong-type"],
+)
+def test_json_schema_validation(validator, data, ok):
+    assert validator.validate_json_schema(data, _PERSON_SCHEMA) is ok
+
+
+_PERSON_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "age": {"type": "integer"},
+        "active": {"type": "boolean"},
+    },
+    "required": ["name", "age", "active"],
+}
+
+
+@pytest.mark.parametrize(
+    "data,ok",
+    [
+        ({"name": "John", "age": 30, "active": True}, True),
+        ({"name": "John", "age": "30", "active": True}, False),  # Should be int
+        ({"name": "John", "active": True}, False),  # Missing age
+    ],
+    ids=["valid", "wrong-type", "missing"],
+)
+def test_json_schema_validation_compiled(validator, data, ok):
+    assert validator.validate_json_schema(data, _PERSON_JSON_SCHEMA) is ok
+
+
+def test_json_schema_validation_mutated_schema(validator):
+    # A schema changed after first use must not reuse the stale validator
+    schema = {"type": "object", "required": ["name"]}
+    assert not validator.validate_json_schema({}, schema)
+    schema["required"] = []
+    assert validator.validate_json_schema({}, schema)
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {"type": "object", "name": str},
+        {"type": "object", "properties": {"name": str}},
+    ],
+    ids=["top-level", "nested"],
+)
+def test_json_schema_validation_rejects_python_types(validator, schema):
+    with pytest.raises(ValueError):
+        validator.validate_json_schema({"name": "John"}, schema)
+
+
+async def test_error_handling(async_client):
     # Test custom exception handling
-    response = client.get("/nonexistent")
+    response = await async_client.get("/nonexistent")
     assert response.status_code == 404
     assert "detail" in response.json()
 
     # Test rate limit error
-    for _ in range(61):  # Exceed rate limit
-        client.get("/health")
-    response = client.get("/health")
+    await asyncio.gather(*(async_client.get("/health") for _ in range(61)))  # Exceed rate limit
+    response = await async_client.get("/health")
     assert response.status_code == 429
     assert "Too many requests" in response.json()["detail"]
 
 
-def test_method_validation():
+def test_method_validation(client):
     # Test allowed methods
     assert client.get("/health").status_code == 200
     assert client.post("/health").status_code == 405  # Method not allowed
 
 
-def test_host_validation():
+def test_host_validation(client):
     # Test host header validation
     response = client.get("/health", headers={"Host": "invalid.host"})
     assert response.status_code == 400